@@ -0,0 +1,70 @@
+# 검색량 예측 백테스트: 빠른 예측(배치 Holt-Winters) vs Prophet
+# 마지막 N개월 전 시점에서 잘라 학습하고 이후 6개월을 예측해 sMAPE / 구간 포함률 / 실행 시간 비교
+# 실행: python -m benchmarks.backtest_forecast
+import time
+import numpy as np
+from utils.search_store import read_search_volume
+from utils.forecast_store import fast_forecast_all, fit_forecast, FAST_PARAMS, PROPHET_PARAMS
+
+CUTOFFS = [6, 12, 18, 24]
+
+
+def smape(actual, predicted):
+    denom = np.abs(actual) + np.abs(predicted)
+    return float(np.mean(np.where(denom > 0, 2 * np.abs(predicted - actual) / np.where(denom > 0, denom, 1), 0)) * 100)
+
+
+def evaluate(test, forecasts, horizon):
+    scores, covered = [], []
+    for keyword, forecast in forecasts.items():
+        actual = test[keyword].to_numpy(dtype=float)
+        future = forecast.tail(horizon).iloc[:len(actual)]
+        scores.append(smape(actual, future['yhat'].to_numpy()))
+        covered.append(np.mean((actual >= future['yhat_lower'].to_numpy()) & (actual <= future['yhat_upper'].to_numpy())))
+    return np.mean(scores), np.mean(covered)
+
+
+def run_fast(train):
+    return fast_forecast_all(train)
+
+
+def run_prophet(train):
+    forecasts = {}
+    for keyword in train.columns[1:]:
+        df_target = train[['ds', keyword]].rename(columns={keyword: 'y'})
+        forecasts[keyword] = fit_forecast(df_target, PROPHET_PARAMS)
+    return forecasts
+
+
+def main():
+    df_raw = read_search_volume()
+    horizon = FAST_PARAMS['periods']
+    engines = {'빠른 예측 (Holt-Winters)': run_fast, 'Prophet': run_prophet}
+    try:
+        import prophet  # noqa: F401
+    except ImportError:
+        print("⚠️ prophet 미설치 — 빠른 예측만 평가합니다.")
+        engines.pop('Prophet')
+
+    print(f"키워드 {len(df_raw.columns) - 1}개, 예측 기간 {horizon}개월")
+    for name, engine in engines.items():
+        for cutoff in CUTOFFS:
+            train = df_raw.iloc[:-cutoff]
+            test = df_raw.iloc[len(df_raw) - cutoff:len(df_raw) - cutoff + horizon]
+            start = time.perf_counter()
+            forecasts = engine(train)
+            elapsed = time.perf_counter() - start
+            score, coverage = evaluate(test, forecasts, horizon)
+            print(f"{name:<24} 컷오프 -{cutoff:>2}개월  sMAPE {score:6.2f}%  구간 포함률 {coverage:5.1%}  {elapsed:8.3f}s")
+
+    # 기준선: 마지막 값 유지
+    for cutoff in CUTOFFS:
+        train = df_raw.iloc[:-cutoff]
+        test = df_raw.iloc[len(df_raw) - cutoff:len(df_raw) - cutoff + horizon]
+        naive = np.mean([smape(test[k].to_numpy(dtype=float), np.repeat(float(train[k].iloc[-1]), len(test)))
+                         for k in df_raw.columns[1:]])
+        print(f"{'마지막 값 유지':<24} 컷오프 -{cutoff:>2}개월  sMAPE {naive:6.2f}%")
+
+
+if __name__ == '__main__':
+    main()
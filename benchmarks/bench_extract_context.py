@@ -0,0 +1,40 @@
+# 전체 코퍼스 기준 extract_context 벤치마크 (기존 구현 대비)
+# 실행: python -m benchmarks.bench_extract_context
+import re
+import time
+from collections import Counter
+from utils.data_loader import load_reviews
+from utils.text_cleaner import STOPWORDS, extract_context
+from tabs.tab3_brand_keyword import POS_TARGETS, NEG_TARGETS
+
+
+def extract_context_legacy(texts, targets, stopwords=STOPWORDS):
+    phrases = []
+    for text in texts:
+        words = re.findall(r'[가-힣]{2,}', text)
+        phrases.extend([
+            words[i - 1] for i, word in enumerate(words)
+            if i > 0 and any(t in word for t in targets) and words[i - 1] not in stopwords
+        ])
+    return Counter(phrases)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    reviews, _ = load_reviews()
+    texts = reviews['리뷰 내용'].tolist()
+    print(f"리뷰 {len(texts):,}건")
+    for name, targets in [('POS_TARGETS', POS_TARGETS), ('NEG_TARGETS', NEG_TARGETS), ('TARGETS', POS_TARGETS + NEG_TARGETS)]:
+        expected, t_old = timed(extract_context_legacy, texts, targets)
+        result, t_new = timed(extract_context, texts, targets)
+        assert list(result.items()) == list(expected.items()), f"{name} 결과 불일치"
+        print(f"{name:12s} 기존 {t_old:6.2f}s → 오토마톤 {t_new:6.2f}s  ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
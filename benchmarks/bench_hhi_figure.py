@@ -0,0 +1,70 @@
+# tab8 HHI 그림 생성 벤치마크: 트레이스 수 / 그림 JSON 크기 / 생성 시간 (기존 구현 대비)
+# 실행: python -m benchmarks.bench_hhi_figure
+import time
+import plotly.graph_objects as go
+from utils.search_store import SearchVolumeStore, read_search_volume
+from utils.market_cube import calculate_hhi
+from tabs.tab8_comprete import competitor_brands, plot_hhi
+
+
+def get_top_brands_tooltip_legacy(date, shares):
+    shares = shares.dropna()
+    tooltip = f"{date.strftime('%Y-%m')}\n\n"
+    if shares.empty or shares.sum() == 0:
+        return tooltip + "데이터 없음"
+    tooltip += "<상위 3위><br>"
+    for i, (brand, share) in enumerate(shares.sort_values(ascending=False).head(3).items(), start=1):
+        tooltip += f"{i}위: {brand} ({share*100:.1f}%)<br>"
+    return tooltip
+
+
+def plot_hhi_legacy(df, brands, title):
+    hhi, market_share = calculate_hhi(df[brands])
+    high_th, low_th = hhi.quantile(0.9), hhi.quantile(0.1)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=hhi.index, y=hhi, mode='lines', line=dict(color='blue'), name='HHI'))
+    for date in hhi.index:
+        val = hhi.loc[date]
+        color = 'red' if val >= high_th else 'green' if val <= low_th else None
+        if color:
+            fig.add_trace(go.Scatter(x=[date], y=[val], mode='markers', marker=dict(color=color, size=10),
+                                     hovertext=[get_top_brands_tooltip_legacy(date, market_share.loc[date])],
+                                     hoverinfo="text"))
+    sub = df[brands]
+    for brand in sub.columns:
+        non_zero = sub[sub[brand] > 0].index
+        if len(non_zero):
+            debut = non_zero[0]
+            fig.add_trace(go.Scatter(x=[debut], y=[hhi.loc[debut]], mode='markers',
+                                     marker=dict(color='yellow', size=10, symbol='star'),
+                                     customdata=[[f"{debut.strftime('%Y-%m')}<br>브랜드 등장: {brand}"]],
+                                     hovertemplate="%{customdata[0]}<extra></extra>"))
+    fig.update_layout(title=title, xaxis_title='월', yaxis_title='HHI 지수',
+                      hoverlabel=dict(font_size=14), showlegend=False)
+    return fig, hhi, market_share
+
+
+def measure(func, df, brands, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fig, _, _ = func(df, brands, "HHI")
+    elapsed = (time.perf_counter() - start) / repeat
+    return len(fig.data), len(fig.to_json().encode('utf-8')), elapsed
+
+
+def main():
+    store = SearchVolumeStore(read_search_volume())
+    brand_category = store.brand_categories(competitor_brands)
+    markets = {'전체': [b for b in competitor_brands if b in store.wide.columns and b != '연초']}
+    for category in ['액상형', '일회용', '궐련형']:
+        markets[category] = [b for b, cats in brand_category.items() if category in cats and b != '연초']
+
+    print(f"{'시장':<6}{'구현':<8}{'트레이스':>8}{'JSON(KB)':>10}{'생성(ms)':>10}")
+    for market, brands in markets.items():
+        for name, func in (('기존', plot_hhi_legacy), ('배치', plot_hhi)):
+            traces, payload, elapsed = measure(func, store.wide, brands)
+            print(f"{market:<6}{name:<8}{traces:>8}{payload / 1024:>10.1f}{elapsed * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# tab6 주제 이름 붙이기(label_topics) 점검: 로컬 스텁 서버로 동시 요청 / 시간 초과 대체 / 캐시 / 실패 재요청 제한 확인
+# 실행: python -m benchmarks.check_topic_labels
+# (대시보드를 같은 스텁에 붙이려면 OPENAI_API_BASE=http://127.0.0.1:<port>/v1 로 실행)
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.topic_labels import label_topics
+
+SLOW_WORD = '느림'
+DELAY, SLOW_DELAY, TIMEOUT = 0.5, 3.0, 1.5
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI chat.completions 형식으로 첫 키워드를 주제 이름으로 돌려주는 스텁 ('느림' 이 있으면 늦게 응답)"""
+    calls = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        keywords = body['messages'][0]['content']
+        StubHandler.calls.append(keywords)
+        time.sleep(SLOW_DELAY if SLOW_WORD in keywords else DELAY)
+        content = f"주제:{keywords.split(',')[0]}"
+        payload = json.dumps({'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+
+    def request_label(keywords):
+        data = json.dumps({'messages': [{'role': 'user', 'content': ','.join(keywords)}]}).encode('utf-8')
+        req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=SLOW_DELAY * 2) as response:
+            return json.load(response)['choices'][0]['message']['content'].strip()
+
+    def fallback(keywords):
+        return '대체'
+
+    path = os.path.join(tempfile.mkdtemp(), 'labels.json')
+    topics = [['배송', '빠름'], ['가격', '저렴'], [SLOW_WORD, '맛'], ['디자인', '색상']]
+
+    start = time.time()
+    labels = label_topics(topics, request_label, fallback, path=path, timeout=TIMEOUT)
+    elapsed = time.time() - start
+    print(f"1차: {labels} ({elapsed:.2f}s)")
+    assert labels == ['주제:배송', '주제:가격', '대체', '주제:디자인'], labels
+    # 0.5초 요청 3개가 동시에 처리되고, 늦은 요청은 timeout 에서 끊긴다
+    assert elapsed < TIMEOUT + DELAY, elapsed
+
+    calls = len(StubHandler.calls)
+    start = time.time()
+    labels = label_topics([['빠름 ', '배송', '배송']] + topics, request_label, fallback, path=path, timeout=TIMEOUT)
+    elapsed = time.time() - start
+    print(f"2차: {labels} ({elapsed:.2f}s, 새 요청 {len(StubHandler.calls) - calls}개)")
+    # 성공한 이름은 캐시(키워드 집합 기준)에서, 실패한 주제는 재요청 없이 바로 대체
+    assert labels == ['주제:배송', '주제:배송', '주제:가격', '대체', '주제:디자인'], labels
+    assert len(StubHandler.calls) == calls, StubHandler.calls
+    assert elapsed < DELAY, elapsed
+
+    labels = label_topics([[SLOW_WORD, '맛']], request_label, fallback, path=path, timeout=SLOW_DELAY * 2, failure_ttl=0)
+    print(f"재요청 제한 해제 후: {labels}")
+    assert labels == [f"주제:{SLOW_WORD}"], labels
+    with open(path, encoding='utf-8') as f:
+        assert len(json.load(f)) == 4
+
+    server.shutdown()
+    print("✅ label_topics 점검 통과")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,28 @@
 import streamlit as st
+import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from utils.brand_stats import summarize_frame
 
-def show_summary(df, label):
-    review_count = len(df)
-    mean_rating = df['별점'].mean()
-    mean_length = df['리뷰 내용'].astype(str).apply(len).mean()
+# 요약은 GroupedReviews.summary(키) 결과(통계표 한 행)를 받는다. 리뷰 프레임을 주면 그 자리에서 계산
+def _as_summary(summary):
+    return summarize_frame(summary) if isinstance(summary, pd.DataFrame) else summary
 
-    st.metric(f"{label} 리뷰 수", review_count)
-    st.metric(f"{label} 평균 별점", f"{mean_rating:.2f}")
-    st.metric(f"{label} 평균 길이", f"{mean_length:.1f}자")
-    
-@st.cache_data
-def show_summary_metrics(df1, df2):
-    def summarize(df):
-        return {
-            '리뷰 수': len(df),
-            '평균 별점': df['별점'].mean(),
-            '평균 리뷰 길이': df['리뷰 내용'].apply(len).mean(),
-        }
+def show_summary(summary, label):
+    summary = _as_summary(summary)
+
+    st.metric(f"{label} 리뷰 수", summary['리뷰 수'])
+    st.metric(f"{label} 평균 별점", f"{summary['평균 별점']:.2f}")
+    st.metric(f"{label} 평균 길이", f"{summary['평균 리뷰 길이']:.1f}자")
 
-    summary1 = summarize(df1)
-    summary2 = summarize(df2)
+@st.cache_data
+def show_summary_metrics(summary1, summary2):
+    summary1 = _as_summary(summary1)
+    summary2 = _as_summary(summary2)
 
     col1, col2 = st.columns(2)
     with col1:
-        
+
         st.metric("리뷰 수", summary1['리뷰 수'])
         st.metric("평균 별점", f"{summary1['평균 별점']:.2f}")
         st.metric("평균 리뷰 길이", f"{summary1['평균 리뷰 길이']:.1f}자")
@@ -33,19 +30,21 @@ def show_summary_metrics(df1, df2):
         st.metric("리뷰 수", summary2['리뷰 수'])
         st.metric("평균 별점", f"{summary2['평균 별점']:.2f}")
         st.metric("평균 리뷰 길이", f"{summary2['평균 리뷰 길이']:.1f}자")
-        
 
-def plot_rating_comparison(df1, df2, tags):
-    def plot_rating_distribution(df, title):
+
+def plot_rating_comparison(summary1, summary2, tags):
+    def plot_rating_distribution(summary, title):
+        distribution = _as_summary(summary)['별점 분포']
+        ratings = [r for r, n in distribution.items() if n]
         fig, ax = plt.subplots()
-        sns.countplot(x='별점', data=df, ax=ax, palette='coolwarm')
+        sns.barplot(x=ratings, y=[distribution[r] for r in ratings], ax=ax, palette='coolwarm')
         ax.set_title(title)
         st.pyplot(fig)
 
     col1, col2 = st.columns(2)
     with col1:
         st.markdown(f"### 📊 {tags[0]} 요약")
-        plot_rating_distribution(df1, f"{tags[0]} 별점 분포")
+        plot_rating_distribution(summary1, f"{tags[0]} 별점 분포")
     with col2:
         st.markdown(f"### 📊 {tags[1]} 요약")
-        plot_rating_distribution(df2, f"{tags[1]} 별점 분포")
\ No newline at end of file
+        plot_rating_distribution(summary2, f"{tags[1]} 별점 분포")
\ No newline at end of file
@@ -2,52 +2,40 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 import streamlit as st
-from utils.text_cleaner import extract_context
 
 def prepare_treemap_data(tag_grouped_dfs, targets, stopwords):
-    all_texts = [text for df in tag_grouped_dfs.values() for text in df['리뷰 내용']]
-    full_counter = extract_context(all_texts, targets, stopwords)
-    top_keywords = set([word for word, _ in full_counter.most_common(20)])
-
-    rows = []
-    keyword_freq_by_brand = {}
-    for tag, df in tag_grouped_dfs.items():
-        counter = extract_context(df['리뷰 내용'], targets, stopwords)
-        for word, freq in counter.items():
-            if word in top_keywords:
-                keyword_freq_by_brand.setdefault(word, []).append((tag, freq))
-
-    for word, brand_list in keyword_freq_by_brand.items():
-        top_brands = sorted(brand_list, key=lambda x: x[1], reverse=True)[:7]  # Limit to 7
-        for tag, freq in top_brands:
-            rows.append({"키워드": word, "제품": tag, "빈도": freq})
-
-    return pd.DataFrame(rows)
+    # 코퍼스 대신 (데이터셋 버전, 그룹 기준)으로 캐시
+    return _prepare_treemap_frames(tag_grouped_dfs, tag_grouped_dfs.version, tag_grouped_dfs.column, targets, stopwords)[0]
 
 def prepare_log_nom_treemap_data(tag_grouped_dfs, targets, stopwords):
-    all_texts = [text for df in tag_grouped_dfs.values() for text in df['리뷰 내용']]
-    full_counter = extract_context(all_texts, targets, stopwords)
-    top_keywords = set([word for word, _ in full_counter.most_common(20)])
-
-    rows = []
-    review_counts = {tag: len(df) for tag, df in tag_grouped_dfs.items()}
-
-    keyword_freq_by_brand = {}
-    for tag, df in tag_grouped_dfs.items():
-        counter = extract_context(df['리뷰 내용'], targets, stopwords)
-        total_reviews = review_counts[tag]
-        for word, freq in counter.items():
-            if word in top_keywords:
-                raw_ratio = freq / total_reviews if total_reviews > 0 else 0
-                log_norm_freq = np.log1p(raw_ratio)
-                keyword_freq_by_brand.setdefault(word, []).append((tag, log_norm_freq))
-
-    for word, brand_list in keyword_freq_by_brand.items():
-        top_brands = sorted(brand_list, key=lambda x: x[1], reverse=True)[:7]  # Limit to 7
-        for tag, log_norm_freq in top_brands:
-            rows.append({"키워드": word, "제품": tag, "로그정규화_빈도": log_norm_freq})
-
-    return pd.DataFrame(rows)
+    return _prepare_treemap_frames(tag_grouped_dfs, tag_grouped_dfs.version, tag_grouped_dfs.column, targets, stopwords)[1]
+
+@st.cache_data(max_entries=32)
+def _prepare_treemap_frames(_tag_grouped_dfs, version, group_column, targets, stopwords):
+    # 빈도/로그정규화 트리맵을 리뷰 × 문맥 단어 희소 행렬 하나에서 같이 계산
+    tag_grouped_dfs = _tag_grouped_dfs
+    matrix = tag_grouped_dfs.context_matrix(targets, stopwords)
+    cols, totals = matrix.ordered_totals(tag_grouped_dfs.all_rows())
+    # most_common 과 같은 순서: 빈도 내림차순, 동률은 첫 등장 순
+    top = set(cols[np.argsort(-totals, kind='stable')[:20]])
+    # 그룹이 매핑 순서대로 이어져 있으므로 첫 등장 순서 = 기존 브랜드별 순회 순서
+    keywords = [c for c in cols if c in top]
+
+    freq = matrix.group_counts(tag_grouped_dfs, keywords)
+    review_counts = tag_grouped_dfs.sizes().to_numpy()
+    tags = freq.index.to_numpy()
+
+    rows, log_rows = [], []
+    for word in freq.columns:
+        counts = freq[word].to_numpy()
+        present = np.flatnonzero(counts > 0)
+        for i in present[np.argsort(-counts[present], kind='stable')][:7]:  # Limit to 7
+            rows.append({"키워드": word, "제품": tags[i], "빈도": int(counts[i])})
+        log_norm = np.log1p(counts[present] / review_counts[present])
+        for j in np.argsort(-log_norm, kind='stable')[:7]:
+            log_rows.append({"키워드": word, "제품": tags[present[j]], "로그정규화_빈도": log_norm[j]})
+
+    return pd.DataFrame(rows), pd.DataFrame(log_rows)
 
 def show_treemap(df_plot, value_col, title):
     if df_plot.empty:
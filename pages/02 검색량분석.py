@@ -3,7 +3,7 @@ import matplotlib.pyplot as plt
 import matplotlib as mpl
 import matplotlib.font_manager as fm
 import os
-from utils.data_loader import load_data
+from utils.data_loader import load_data, refresh_data
 from tabs import (
     tab5_rising_keywords,
     tab8_comprete,
@@ -27,7 +27,9 @@ mpl.rcParams['axes.unicode_minus'] = False
 
 
 st.title("검색량 분석 대시보드")
-# 데이터 로딩
+# 데이터 로딩 (모든 세션이 공유하는 저장소)
+if st.sidebar.button("🔄 데이터 새로고침"):
+    refresh_data()
 category_grouped_dfs, tag_grouped_dfs = load_data()
 
 # 탭처럼 보이는 radio UI
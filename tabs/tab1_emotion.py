@@ -5,7 +5,8 @@ import matplotlib.font_manager as fm
 import seaborn as sns
 from components.wordcloud_plot import generate_wordcloud_image
 from components.treemap_plot import prepare_log_nom_treemap_data, show_treemap
-from utils.text_cleaner import STOPWORDS, extract_context
+from utils.text_cleaner import STOPWORDS
+from utils.tokens import context_counts
 from utils.summary import calculate_summary, show_summary_box
 from collections import Counter
 import os
@@ -48,20 +49,22 @@ def render(category_grouped_dfs):
         st.warning("⚠️ '리뷰작성일' 컬럼이 누락되었습니다.")
         return
 
-    df = df.copy()
-    
-    df['리뷰작성일'] = pd.to_datetime(df['리뷰작성일'], format='%Y%m%d', errors='coerce')
-    df = df.dropna(subset=['리뷰작성일'])
-    df['월'] = df['리뷰작성일'].dt.to_period('M')
+    # 날짜를 읽지 못한 리뷰는 키워드 추출에서도 제외 (월별 집계표와 같은 행 집합)
+    if df['리뷰작성일'].isna().any():
+        df = df[df['리뷰작성일'].notna()]
 
-    months = sorted(df['월'].unique())
+    # 월 목록/월별 차트는 사전 집계표에서 (원본 복사·재집계 없음)
+    monthly = category_grouped_dfs.monthly(selected)
+    months = monthly.index.tolist()
     
     if df is None or df.empty:
         st.warning("⚠️ 해당 제품의 리뷰 데이터가 없습니다.")
         return
-    summary = calculate_summary(df)
+    summary = calculate_summary(df, category_grouped_dfs.index)
     show_summary_box(summary)
     
+    # 캐시 키: 데이터셋 버전 + (그룹, 선택 기간)
+    scope = ('category', selected)
     if len(months) >= 2:
         date_range = [p.to_timestamp() for p in months]
         start_date = date_range[0].date()
@@ -73,13 +76,12 @@ def render(category_grouped_dfs):
             value=(start_date, end_date),
             format="YYYY-MM"
         )
+        scope += (str(selected_range[0]), str(selected_range[1]))
         df = df[(df['리뷰작성일'] >= pd.to_datetime(selected_range[0])) &
                 (df['리뷰작성일'] <= pd.to_datetime(selected_range[1]) + pd.offsets.MonthEnd(0))]
+        monthly = category_grouped_dfs.monthly(selected, selected_range[0], selected_range[1])
 
-    df['월'] = df['리뷰작성일'].dt.to_period('M').astype(str)
-    df['리뷰길이'] = df['리뷰 내용'].astype(str).apply(len)
-
-    monthly_summary = df.groupby('월').agg({'리뷰 내용': 'count', '별점': 'mean'}).rename(columns={'리뷰 내용': '리뷰 수'}).reset_index()
+    monthly_summary = pd.DataFrame({'월': monthly.index.astype(str), '리뷰 수': monthly['리뷰 수'].to_numpy(), '별점': monthly['평균 별점'].to_numpy()})
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
     step = 1 if len(monthly_summary) <= 12 else 2 if len(monthly_summary) <= 24 else 4
     ticks = monthly_summary['월'].tolist()[::step]
@@ -98,8 +100,8 @@ def render(category_grouped_dfs):
     axes[1].set_ylabel('별점', fontproperties=font_prop)
     st.pyplot(fig)
 
-    pos = extract_context(df['리뷰 내용'], POS_TARGETS)
-    neg = extract_context(df['리뷰 내용'], NEG_TARGETS)
+    pos = context_counts(category_grouped_dfs.tokens, category_grouped_dfs.version, scope, df.index, POS_TARGETS)
+    neg = context_counts(category_grouped_dfs.tokens, category_grouped_dfs.version, scope, df.index, NEG_TARGETS)
 
     #========================================
     # ✅ 요약용 키워드 추출
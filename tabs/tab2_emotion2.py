@@ -4,7 +4,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from components.wordcloud_plot import generate_wordcloud_image
 from components.treemap_plot import prepare_log_nom_treemap_data, show_treemap
-from utils.text_cleaner import STOPWORDS, extract_context, normalize_texts
+from utils.text_cleaner import STOPWORDS
+from utils.tokens import context_counts
 from collections import Counter
 from soynlp.word import WordExtractor
 from soynlp.tokenizer import LTokenizer
@@ -51,13 +52,16 @@ def render(tag_grouped_dfs):
         st.warning("⚠️ '리뷰작성일' 컬럼이 누락되었습니다.")
         return
 
-    # okt = Okt()
-    df = df.copy()
-    df['리뷰작성일'] = pd.to_datetime(df['리뷰작성일'], format='%Y%m%d', errors='coerce')
-    df = df.dropna(subset=['리뷰작성일'])
-    df['월'] = df['리뷰작성일'].dt.to_period('M')
+    # 날짜를 읽지 못한 리뷰는 키워드 추출에서도 제외 (월별 집계표와 같은 행 집합)
+    if df['리뷰작성일'].isna().any():
+        df = df[df['리뷰작성일'].notna()]
 
-    months = sorted(df['월'].unique())
+    # okt = Okt()
+    # 월 목록/월별 차트는 사전 집계표에서 (원본 복사·재집계 없음)
+    monthly = tag_grouped_dfs.monthly(selected)
+    months = monthly.index.tolist()
+    # 캐시 키: 데이터셋 버전 + (그룹, 선택 기간)
+    scope = ('tag', selected)
     if len(months) >= 2:
         date_range = [p.to_timestamp() for p in months]
         start_date = date_range[0].date()
@@ -69,13 +73,12 @@ def render(tag_grouped_dfs):
             value=(start_date, end_date),
             format="YYYY-MM"
         )
+        scope += (str(selected_range[0]), str(selected_range[1]))
         df = df[(df['리뷰작성일'] >= pd.to_datetime(selected_range[0])) &
                 (df['리뷰작성일'] <= pd.to_datetime(selected_range[1]) + pd.offsets.MonthEnd(0))]
+        monthly = tag_grouped_dfs.monthly(selected, selected_range[0], selected_range[1])
 
-    df['월'] = df['리뷰작성일'].dt.to_period('M').astype(str)
-    df['리뷰길이'] = df['리뷰 내용'].astype(str).apply(len)
-
-    monthly_summary = df.groupby('월').agg({'리뷰 내용': 'count', '별점': 'mean'}).rename(columns={'리뷰 내용': '리뷰 수'}).reset_index()
+    monthly_summary = pd.DataFrame({'월': monthly.index.astype(str), '리뷰 수': monthly['리뷰 수'].to_numpy(), '별점': monthly['평균 별점'].to_numpy()})
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
     step = 1 if len(monthly_summary) <= 12 else 2 if len(monthly_summary) <= 24 else 4
     ticks = monthly_summary['월'].tolist()[::step]
@@ -95,21 +98,6 @@ def render(tag_grouped_dfs):
     st.pyplot(fig)
 
 
-    # 텍스트 불러오기
-    texts = df[df['별점'] <= 3]['리뷰 내용'].dropna().astype(str).tolist()
-
-    
-    # 부정 키워드 및 가중치
-    negative_seeds = [
-        '불편', '별로', '고장', '느림', '실망', '짜증', '화남', '불만',
-        '아쉬움', '부족', '불쾌', '지루', '불친절', '복잡', '헷갈림',
-        '약함', '무거움', '불량'
-    ]
-    weight_map = {word: 2 for word in negative_seeds}
-
-    st.spinner("✅ 텍스트 전처리 및 정규화 중입니다...")
-    normalized_texts = normalize_texts(texts)
-
     # 2-3그램 추출
     # vectorizer = CountVectorizer(ngram_range=(2, 3), min_df=1)
     # X = vectorizer.fit_transform(normalized_texts)
@@ -136,8 +124,8 @@ def render(tag_grouped_dfs):
 
 
 # ==========================================================================================================
-    pos = extract_context(df['리뷰 내용'], POS_TARGETS)
-    neg = extract_context(df['리뷰 내용'], NEG_TARGETS)
+    pos = context_counts(tag_grouped_dfs.tokens, tag_grouped_dfs.version, scope, df.index, POS_TARGETS)
+    neg = context_counts(tag_grouped_dfs.tokens, tag_grouped_dfs.version, scope, df.index, NEG_TARGETS)
 
     col1, col2 = st.columns(2)
     with col1:
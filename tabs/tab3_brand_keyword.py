@@ -2,22 +2,24 @@ import streamlit as st
 import pandas as pd
 from components.treemap_plot import prepare_treemap_data, prepare_log_nom_treemap_data, show_treemap
 from components.wordcloud_plot import generate_wordcloud_image
-from utils.text_cleaner import STOPWORDS, extract_context
+from utils.text_cleaner import STOPWORDS
+from utils.tokens import context_counts
 
 POS_TARGETS = ['좋', '만족', '훌륭', '깔끔', '편하', '빠르', '예쁘', '감동', '신나', '행복', '사랑', '유용', '기분좋', '재밌', '즐겁', '고급', '세련', '친절', '정확', '튼튼']
 NEG_TARGETS = ['별로', '불편', '고장', '느리', '느림', '실망', '짜증', '화남', '불만', '아쉬', '부족', '망함', '불쾌', '지루', '불친절', '복잡', '헷갈림', '약함', '무거움', '불량']
 
 @st.cache_data
-def get_top_keywords(tag_grouped_dfs, targets):
-    all_texts = [text for df in tag_grouped_dfs.values() for text in df['리뷰 내용']]
-    return extract_context(all_texts, targets)
+def get_top_keywords(_tag_grouped_dfs, version, targets):
+    # 코퍼스는 해시하지 않고 데이터셋 버전으로만 캐시 키 구성
+    # 트리맵과 같은 리뷰 × 문맥 단어 행렬을 공유
+    return _tag_grouped_dfs.context_matrix(targets, STOPWORDS).counter(_tag_grouped_dfs.all_rows())
 
 def render(tag_grouped_dfs):
     st.subheader("제품별 주요 감정 키워드 비교")
 
     with st.spinner("🔍 전체 키워드 분석 중..."):
-        all_pos = get_top_keywords(tag_grouped_dfs, POS_TARGETS)
-        all_neg = get_top_keywords(tag_grouped_dfs, NEG_TARGETS)
+        all_pos = get_top_keywords(tag_grouped_dfs, tag_grouped_dfs.version, POS_TARGETS)
+        all_neg = get_top_keywords(tag_grouped_dfs, tag_grouped_dfs.version, NEG_TARGETS)
 
     col1, col2 = st.columns(2)
     with col1:
@@ -58,7 +60,7 @@ def render(tag_grouped_dfs):
             row = list(tag_grouped_dfs.items())[i:i+5]
             cols = st.columns(len(row))
             for (tag_name, df), col in zip(row, cols):
-                pos_counter = extract_context(df['리뷰 내용'], POS_TARGETS)
+                pos_counter = context_counts(tag_grouped_dfs.tokens, tag_grouped_dfs.version, ('tag', tag_name), df.index, POS_TARGETS)
                 with col:
                     st.markdown(f"**{tag_name}**")
                     if pos_counter:
@@ -73,7 +75,7 @@ def render(tag_grouped_dfs):
             row = list(tag_grouped_dfs.items())[i:i+5]
             cols = st.columns(len(row))
             for (tag_name, df), col in zip(row, cols):
-                neg_counter = extract_context(df['리뷰 내용'], NEG_TARGETS)
+                neg_counter = context_counts(tag_grouped_dfs.tokens, tag_grouped_dfs.version, ('tag', tag_name), df.index, NEG_TARGETS)
                 with col:
                     st.markdown(f"**{tag_name}**")
                     if neg_counter:
@@ -5,7 +5,10 @@ import seaborn as sns
 from wordcloud import WordCloud
 from collections import Counter
 import re
-from utils.text_cleaner import extract_context
+import numpy as np
+from utils.tokens import context_counts
+from utils.text_cleaner import STOPWORDS
+from utils.rollup import RATINGS, RATING_COLUMNS
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import os
@@ -20,6 +23,75 @@ else:
 TARGETS = ['좋', '만족', '훌륭', '깔끔', '편하', '빠르', '예쁘', '감동', '신나', '행복', '사랑', '유용', '기분좋', '재밌', '즐겁', '고급', '세련', '친절', '정확', '튼튼',
            '별로', '불편', '고장', '느리', '느림', '실망', '짜증', '화남', '불만', '아쉬', '부족', '망함', '불쾌', '지루', '불친절', '복잡', '헷갈림', '약함', '무거움', '불량']
 
+MAX_BRANDS = 10
+TOP_KEYWORDS = 20
+
+@st.cache_data(max_entries=4)
+def brand_keyword_matrix(_tag_grouped_dfs, version, targets=tuple(TARGETS)):
+    """전체 브랜드 × 문맥 키워드 빈도표 (리뷰 × 단어 희소 행렬과 브랜드 지시 행렬의 곱 한 번)"""
+    freq = _tag_grouped_dfs.context_matrix(list(targets), STOPWORDS).group_counts(_tag_grouped_dfs)
+    return freq.loc[:, freq.sum() > 0]
+
+def keyword_similarity(freq):
+    """브랜드 키워드 빈도 벡터 간 코사인 유사도"""
+    values = freq.to_numpy(dtype=np.float64)
+    norms = np.linalg.norm(values, axis=1)
+    unit = values / np.where(norms > 0, norms, 1.0)[:, None]
+    return pd.DataFrame(unit @ unit.T, index=freq.index, columns=freq.index)
+
+def render_multi(tag_grouped_dfs):
+    """여러 브랜드 비교 — 통계표/빈도표를 선택한 브랜드 행만 잘라서 그린다"""
+    brand_list = list(tag_grouped_dfs.keys())
+    selected = st.multiselect(f"비교할 브랜드 선택 (최대 {MAX_BRANDS}개)", brand_list,
+                              default=brand_list[:min(5, len(brand_list))],
+                              max_selections=MAX_BRANDS, key="selected_brands_tab4_multi")
+    if len(selected) < 2:
+        st.info("비교할 브랜드를 2개 이상 선택해주세요.")
+        return
+
+    stats = tag_grouped_dfs.statistics(selected)
+    freq = brand_keyword_matrix(tag_grouped_dfs, tag_grouped_dfs.version).loc[selected]
+
+    st.markdown("### 기본 통계 비교")
+    table = stats[['리뷰 수', '평균 별점', '평균 리뷰 길이', '리뷰길이_p50', '리뷰길이_p90']].copy()
+    table['리뷰 수'] = table['리뷰 수'].astype(int)
+    st.dataframe(table.style.format({'평균 별점': '{:.2f}', '평균 리뷰 길이': '{:.1f}',
+                                     '리뷰길이_p50': '{:.0f}', '리뷰길이_p90': '{:.0f}'}))
+
+    st.markdown("### 별점 분포 비교 (%)")
+    shares = stats[RATING_COLUMNS].div(stats['리뷰 수'].replace(0, np.nan), axis=0).fillna(0) * 100
+    shares.columns = RATINGS
+    fig, ax = plt.subplots(figsize=(10, 5))
+    shares.plot(kind='bar', stacked=True, ax=ax, colormap='coolwarm', rot=0)
+    ax.set_xlabel('브랜드', fontproperties=font_prop)
+    ax.set_ylabel('리뷰 비율 (%)', fontproperties=font_prop)
+    ax.set_xticklabels(shares.index, fontproperties=font_prop)
+    ax.legend(title='별점', loc='upper left', bbox_to_anchor=(1, 1))
+    st.pyplot(fig)
+    plt.close(fig)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"### 상위 {TOP_KEYWORDS}개 키워드 비중 (%)")
+        top = freq.sum().nlargest(TOP_KEYWORDS).index
+        totals = freq.sum(axis=1).replace(0, np.nan)
+        share = (freq[top].div(totals, axis=0).fillna(0) * 100).T
+        fig, ax = plt.subplots(figsize=(8, 10))
+        sns.heatmap(share, annot=True, fmt='.1f', cmap='Blues', cbar=False, ax=ax)
+        ax.set_xticklabels(share.columns, fontproperties=font_prop, rotation=45, ha='right')
+        ax.set_yticklabels(share.index, fontproperties=font_prop, rotation=0)
+        st.pyplot(fig)
+        plt.close(fig)
+    with col2:
+        st.markdown("### 키워드 유사도 (코사인)")
+        similarity = keyword_similarity(freq)
+        fig, ax = plt.subplots(figsize=(8, 7))
+        sns.heatmap(similarity, annot=True, fmt='.2f', cmap='coolwarm', vmin=0, vmax=1, ax=ax)
+        ax.set_xticklabels(similarity.columns, fontproperties=font_prop, rotation=45, ha='right')
+        ax.set_yticklabels(similarity.index, fontproperties=font_prop, rotation=0)
+        st.pyplot(fig)
+        plt.close(fig)
+
 def render(tag_grouped_dfs):
     st.subheader("브랜드 리뷰 비교")
 
@@ -27,6 +99,11 @@ def render(tag_grouped_dfs):
         st.warning("⚠️ 비교할 데이터가 없습니다.")
         return
 
+    mode = st.radio("비교 방식", ["2개 브랜드 비교", "여러 브랜드 비교"], horizontal=True, key="tab4_mode")
+    if mode == "여러 브랜드 비교":
+        render_multi(tag_grouped_dfs)
+        return
+
     brand_list = list(tag_grouped_dfs.keys())
 
     # 세션 상태 초기화
@@ -69,13 +146,8 @@ def render(tag_grouped_dfs):
 
     # --------- 분석 시작 (2개 선택 시 자동) ---------
     df1, df2 = tag_grouped_dfs[selected[0]], tag_grouped_dfs[selected[1]]
-
-    def summarize(df):
-        return {
-            '리뷰 수': len(df),
-            '평균 별점': df['별점'].mean(),
-            '평균 리뷰 길이': df['리뷰 내용'].astype(str).apply(len).mean()
-        }
+    # 리뷰 수/평균/별점 분포는 데이터셋 버전당 한 번 계산한 통계표에서 읽음
+    summary1, summary2 = tag_grouped_dfs.summary(selected[0]), tag_grouped_dfs.summary(selected[1])
 
     def plot_wordcloud(freq, title):
         if not freq:
@@ -97,10 +169,12 @@ def render(tag_grouped_dfs):
         except Exception as e:
             st.error(f"워드클라우드 생성 중 오류: {e}")
 
-    def plot_rating_distribution(df, title):
+    def plot_rating_distribution(distribution, title):
+        # 통계표의 별점별 리뷰 수로 막대그래프 (리뷰가 있는 별점만, countplot 과 같은 모양)
+        ratings = [r for r, n in distribution.items() if n]
         try:
             fig, ax = plt.subplots(figsize=(8, 6))
-            sns.countplot(x='별점', data=df, ax=ax, palette='coolwarm')
+            sns.barplot(x=ratings, y=[distribution[r] for r in ratings], ax=ax, palette='coolwarm')
             ax.set_title(title, fontsize=14, pad=20, fontproperties=font_prop)
             ax.set_xlabel('별점', fontproperties=font_prop)
             ax.set_ylabel('리뷰 수', fontproperties=font_prop)
@@ -114,13 +188,11 @@ def render(tag_grouped_dfs):
     col1, col2 = st.columns(2)
     with col1:
         st.markdown(f"#### 📍 {selected[0]}")
-        summary1 = summarize(df1)
         st.metric("리뷰 수", summary1['리뷰 수'])
         st.metric("평균 별점", f"{summary1['평균 별점']:.2f}")
         st.metric("평균 리뷰 길이", f"{summary1['평균 리뷰 길이']:.1f}자")
     with col2:
         st.markdown(f"#### 📍 {selected[1]}")
-        summary2 = summarize(df2)
         st.metric("리뷰 수", summary2['리뷰 수'])
         st.metric("평균 별점", f"{summary2['평균 별점']:.2f}")
         st.metric("평균 리뷰 길이", f"{summary2['평균 리뷰 길이']:.1f}자")
@@ -128,19 +200,19 @@ def render(tag_grouped_dfs):
     st.markdown("### 별점 분포 비교")
     col3, col4 = st.columns(2)
     with col3:
-        plot_rating_distribution(df1, f"{selected[0]} 별점 분포")
+        plot_rating_distribution(summary1['별점 분포'], f"{selected[0]} 별점 분포")
     with col4:
-        plot_rating_distribution(df2, f"{selected[1]} 별점 분포")
+        plot_rating_distribution(summary2['별점 분포'], f"{selected[1]} 별점 분포")
 
     st.markdown("### 키워드 워드클라우드")
     col5, col6 = st.columns(2)
     with col5:
         st.markdown(f"#### {selected[0]}")
-        freq1 = extract_context(df1['리뷰 내용'], TARGETS)
+        freq1 = context_counts(tag_grouped_dfs.tokens, tag_grouped_dfs.version, ('tag', selected[0]), df1.index, TARGETS)
         plot_wordcloud(freq1, f"{selected[0]} 키워드")
     with col6:
         st.markdown(f"#### {selected[1]}")
-        freq2 = extract_context(df2['리뷰 내용'], TARGETS)
+        freq2 = context_counts(tag_grouped_dfs.tokens, tag_grouped_dfs.version, ('tag', selected[1]), df2.index, TARGETS)
         plot_wordcloud(freq2, f"{selected[1]} 키워드")
 
 
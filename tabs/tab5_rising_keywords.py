@@ -1,9 +1,11 @@
 import pandas as pd
-from prophet import Prophet
+import numpy as np
 import streamlit as st
 import plotly.graph_objs as go
 import matplotlib as mpl
 from collections import Counter
+from utils.forecast_store import load_forecast, fast_forecast_all
+from utils.search_store import get_search_store
 
 TARGETS = ['좋', '만족', '훌륭', '깔끔', '편하', '빠르', '예쁘', '감동', '신나', '행복', '사랑', '유용', '기분좋', '재밌', '즐겁', '고급', '세련', '친절', '정확', '튼튼',
            '별로', '불편', '고장', '느리', '느림', '실망', '짜증', '화남', '불만', '아쉬', '부족', '망함', '불쾌', '지루', '불친절', '복잡', '헷갈림', '약함', '무거움', '불량']
@@ -11,37 +13,9 @@ TARGETS = ['좋', '만족', '훌륭', '깔끔', '편하', '빠르', '예쁘', '
 # 폰트 설정
 # mpl.rc('font', family='Malgun Gothic')
 
-# 데이터 불러오기
-df_raw = pd.read_csv('./search_data/월별 검색량 데이터.csv')
-df_raw = df_raw.rename(columns={'월': 'ds'})
-df_raw['ds'] = pd.to_datetime(df_raw['ds'])
-df_melted = df_raw.melt(id_vars=['ds'], var_name='keyword', value_name='search_volume')
-
-# 성장률 계산
-recent_data = df_raw.tail(3)
-previous_data = df_raw.iloc[-6:-3]
-growth_rates = {}
-for keyword in df_raw.columns[1:]:
-    recent_avg = recent_data[keyword].mean()
-    previous_avg = previous_data[keyword].mean()
-    if previous_avg > 0:
-        growth = (recent_avg - previous_avg) / previous_avg * 100
-    else:
-        growth = 0
-    growth_rates[keyword] = growth
-
-top_keywords = pd.Series(growth_rates).sort_values(ascending=False).head(5)
-bottom_keywords = pd.Series(growth_rates).sort_values().head(5)
-
 def get_related_reviews(keyword, tag_grouped_dfs, max_examples=5):
-    results = []
-    for brand_df in tag_grouped_dfs.values():
-        reviews = brand_df['리뷰 내용'].astype(str)
-        matches = reviews[reviews.str.contains(keyword, case=False, na=False)].tolist()
-        results.extend(matches)
-        if len(results) >= max_examples:
-            break
-    return results[:max_examples]
+    # 역색인 조회 (브랜드 순서대로 앞쪽 예시 반환)
+    return tag_grouped_dfs.index.examples(keyword, max_examples)
 
 # 간단한 이벤트 설명 매핑 (예시)
 # event_map = {
@@ -50,40 +24,56 @@ def get_related_reviews(keyword, tag_grouped_dfs, max_examples=5):
 #     "빌리아": "기획 할인 이벤트로 검색량 증가 (2025.01)"
 # }
 
-# Prophet 예측 함수
-def get_forecast(keyword):
-    df_target = df_melted[df_melted['keyword'] == keyword][['ds', 'search_volume']]
-    df_target = df_target.rename(columns={'search_volume': 'y'})
-    model = Prophet(seasonality_mode='multiplicative', changepoint_prior_scale=0.5)
-    model.add_seasonality(name='monthly', period=30.5, fourier_order=5)
-    model.fit(df_target)
-    future = model.make_future_dataframe(periods=6, freq='M')
-    forecast = model.predict(future)
+FORECAST_MODES = ["Prophet", "빠른 예측 (Holt-Winters)"]
+
+# 빠른 예측: 전체 키워드를 한 번에 계산해 두고 키워드별로 꺼내 씀
+@st.cache_data
+def get_fast_forecasts(_store, signature):
+    return fast_forecast_all(_store.frame)
+
+# 예측 함수
+# Prophet: 키워드 + 시계열 지문 + 설정 기준으로 디스크에 저장된 예측 사용, 없을 때만 학습
+# 전체 키워드 사전 학습: python -m utils.forecast_store
+def get_forecast(keyword, mode=FORECAST_MODES[0]):
+    store = get_search_store()
+    df_target = store.target(keyword)
+    if mode == FORECAST_MODES[1]:
+        return df_target, get_fast_forecasts(store, store.signature)[keyword]
+    forecast = load_forecast(keyword, df_target)
     return df_target, forecast
 
 # 리뷰 연관 키워드 추출
 def get_related_keywords(keyword, tag_grouped_dfs, top_n=10):
+    # 키워드 리뷰는 역색인으로 찾고, 대상어 포함 여부는 토큰 표로 판정 (등장 순서까지 기존 Counter 와 동일하게 구성)
+    tokens = tag_grouped_dfs.tokens
+    matched = tag_grouped_dfs.index.rows(keyword)
     co_occurrence = []
-    for brand_df in tag_grouped_dfs.values():
-        reviews = brand_df['리뷰 내용'].astype(str)
-        for text in reviews:
-            if keyword in text:
-                co_occurrence += [word for word in TARGETS if word in text and word != keyword]
-    return Counter(co_occurrence).most_common(top_n)
+    for i, word in enumerate(TARGETS):
+        if word == keyword:
+            continue
+        has_word = tokens.rows_containing([word], matched)
+        if has_word.any():
+            co_occurrence.append((int(np.argmax(has_word)), i, word, int(has_word.sum())))
+    co_occurrence.sort()
+    return Counter({word: count for _, _, word, count in co_occurrence}).most_common(top_n)
 
 # Streamlit UI
 def render(tag_grouped_dfs):
     st.subheader("급상승 키워드 분석")
+    store = get_search_store()
+    growth_rates = store.growth_rates
+    top_keywords = store.top_keywords()
+    bottom_keywords = store.bottom_keywords()
     months = st.slider("표시할 기간 (개월):", min_value=6, max_value=24, step=3, value=12)
-    cutoff = pd.to_datetime(df_raw['ds'].max()) - pd.DateOffset(months=months)
+    cutoff = pd.to_datetime(store.dates.max()) - pd.DateOffset(months=months)
 
     # 급상승 키워드
     st.markdown("### 🔼 최근 급상승 키워드 검색량")
     fig_top = go.Figure()
     for kw in top_keywords.index:
-        df = df_melted[df_melted['keyword'] == kw]
-        df = df[df['ds'] >= cutoff]
-        fig_top.add_trace(go.Scatter(x=df['ds'], y=df['search_volume'],
+        series = store.series(kw)
+        series = series[series.index >= cutoff]
+        fig_top.add_trace(go.Scatter(x=series.index, y=series.values,
                                      mode='lines', name=f"{kw} ({growth_rates[kw]:.1f}%)"))
     fig_top.update_layout(title='급상승 키워드 검색량')
     st.plotly_chart(fig_top)
@@ -92,9 +82,9 @@ def render(tag_grouped_dfs):
     st.markdown("### 🔽 최근 급하락 키워드 검색량")
     fig_bottom = go.Figure()
     for kw in bottom_keywords.index:
-        df = df_melted[df_melted['keyword'] == kw]
-        df = df[df['ds'] >= cutoff]
-        fig_bottom.add_trace(go.Scatter(x=df['ds'], y=df['search_volume'],
+        series = store.series(kw)
+        series = series[series.index >= cutoff]
+        fig_bottom.add_trace(go.Scatter(x=series.index, y=series.values,
                                         mode='lines', name=f"{kw} ({growth_rates[kw]:.1f}%)"))
     fig_bottom.update_layout(title='급하락 키워드 검색량')
     st.plotly_chart(fig_bottom)
@@ -106,7 +96,8 @@ def render(tag_grouped_dfs):
 
     # 트렌드 예측 + 신뢰구간
     st.markdown(f"### `{selected_keyword}` 검색량 트렌드")
-    df_target, forecast = get_forecast(selected_keyword)
+    forecast_mode = st.radio("예측 방식", FORECAST_MODES, horizontal=True)
+    df_target, forecast = get_forecast(selected_keyword, forecast_mode)
     forecast_filtered = forecast[forecast['ds'] >= cutoff]
 
     fig_trend = go.Figure()
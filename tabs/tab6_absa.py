@@ -1,22 +1,21 @@
 import streamlit as st
 import pandas as pd
-from sklearn.decomposition import LatentDirichletAllocation
-from sklearn.feature_extraction.text import TfidfVectorizer
-from konlpy.tag import Okt
 import openai
 import os
+from utils.topic_store import load_topic_model
+from utils.topic_labels import LABEL_TIMEOUT, label_topics
 
-# ✅ OpenAI 클라이언트
-try:
-    client = openai.OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-    gpt_enabled = True
-except Exception:
-    gpt_enabled = False
+# ✅ OpenAI 설정 (secrets 우선, 없으면 환경 변수. OPENAI_API_BASE 로 로컬 스텁 서버 지정 가능)
+def _setting(name):
+    try:
+        return st.secrets[name]
+    except Exception:
+        return os.environ.get(name)
 
-# 형태소 분석 함수
-def tokenize(text: str) -> str:
-    okt = Okt()
-    return ' '.join(okt.nouns(text)) if isinstance(text, str) else ''
+api_key = _setting("OPENAI_API_KEY")
+api_base = _setting("OPENAI_API_BASE")
+gpt_enabled = bool(api_key)
+LABEL_MODEL = "gpt-3.5-turbo"
 
 # 키워드 기반 간단한 분류 (Fallback)
 def summarize_topic_keywords(keywords: list[str]) -> str:
@@ -32,25 +31,42 @@ def summarize_topic_keywords(keywords: list[str]) -> str:
     else:
         return '🌀 기타'
 
-# GPT 주제 라벨링 함수 (오류 시 fallback 사용)
-def get_topic_label(keywords: list[str]) -> str:
-    if not gpt_enabled:
-        return summarize_topic_keywords(keywords)
-
-    prompt = f"""
+def _topic_prompt(keywords: list[str]) -> str:
+    return f"""
 다음 키워드들을 대표할 수 있는 주제를 한국어로 간결하게 만들어 주세요.
 키워드: {', '.join(keywords)}
 형식: 하나의 주제 이름만 출력 (예: '가격 평가', '맛', '배송 경험')
 """
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.5
-        )
+
+# GPT 요청 하나 (실패 시 예외 — 대체는 label_topics 에서 처리)
+def request_topic_label(keywords: list[str]) -> str:
+    messages = [{"role": "user", "content": _topic_prompt(keywords)}]
+    if hasattr(openai, "OpenAI"):
+        # openai>=1.0
+        client = openai.OpenAI(api_key=api_key, base_url=api_base, timeout=LABEL_TIMEOUT)
+        response = client.chat.completions.create(model=LABEL_MODEL, messages=messages, temperature=0.5)
         return response.choices[0].message.content.strip()
-    except Exception:
-        return summarize_topic_keywords(keywords)
+    response = openai.ChatCompletion.create(
+        model=LABEL_MODEL, messages=messages, temperature=0.5,
+        api_key=api_key, api_base=api_base or openai.api_base, request_timeout=LABEL_TIMEOUT
+    )
+    return response["choices"][0]["message"]["content"].strip()
+
+# 주제 목록 전체 라벨링: 캐시에 없는 주제만 동시에 요청, 시간 초과/오류 주제는 키워드 분류로 대체
+def get_topic_labels(topics: list[list[str]]) -> list[str]:
+    if not gpt_enabled:
+        return [summarize_topic_keywords(keywords) for keywords in topics]
+    return label_topics(topics, request_topic_label, summarize_topic_keywords)
+
+# 브랜드 주제 모델 (세션 간 공유, 디스크에 저장된 모델에 새 리뷰만 partial_fit)
+@st.cache_resource(max_entries=16)
+def get_topic_model(_reviews, brand, version, n_topics):
+    return load_topic_model(brand, _reviews, n_topics)
+
+@st.cache_data(max_entries=64)
+def get_topic_keywords(_reviews, brand, version, n_topics, n_keywords):
+    model = get_topic_model(_reviews, brand, version, n_topics)
+    return None if model is None else model.topics(n_keywords)
 
 # 전체 분석 함수
 def render(df: pd.DataFrame, n_topics: int = 4, n_keywords: int = 10):
@@ -58,6 +74,7 @@ def render(df: pd.DataFrame, n_topics: int = 4, n_keywords: int = 10):
     st.subheader('**주제 이름은 참고만 부탁 드립니다**')
 
     selected_brand = st.selectbox("브랜드를 선택하세요", df.keys())
+    version = getattr(df, 'version', None)
     df = df[selected_brand]
 
     if '리뷰 내용' not in df.columns:
@@ -65,28 +82,17 @@ def render(df: pd.DataFrame, n_topics: int = 4, n_keywords: int = 10):
         st.write("컬럼 목록:", df.columns.tolist())
         return
 
-    df = df.copy()
-    df['형태소'] = df['리뷰 내용'].astype(str).apply(tokenize)
-
-    vectorizer = TfidfVectorizer(max_df=0.9, min_df=2)
-    dtm = vectorizer.fit_transform(df['형태소'])
-
-    if dtm.shape[0] == 0 or dtm.shape[1] == 0:
+    topics = get_topic_keywords(df, selected_brand, version, n_topics, n_keywords)
+    if topics is None:
         st.warning("❗ 유효한 텍스트가 부족합니다.")
         return
 
-    lda = LatentDirichletAllocation(n_components=n_topics, random_state=42)
-    lda.fit(dtm)
-
-    vocab = vectorizer.get_feature_names_out()
     topic_data = []
 
     st.info("🔍 주제 추출 중...")
 
-    for idx, topic in enumerate(lda.components_):
-        keywords = [vocab[i] for i in topic.argsort()[:-n_keywords - 1:-1]]
-        label = get_topic_label(keywords)
-
+    labels = get_topic_labels(topics)
+    for idx, (keywords, label) in enumerate(zip(topics, labels)):
         topic_data.append({
             "주제 번호": f"주제 {idx+1}",
             "주제 이름": label,
@@ -2,7 +2,6 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import re
 from datetime import datetime
 
 
@@ -18,61 +17,82 @@ extended_keywords = {
 }
 
 
-# 분석 함수
-def analyze_sentiment_with_examples(df, rating_range=(1, 5)):
-    df = df.copy()
-    df['리뷰 내용'] = df['리뷰 내용'].fillna("").str.lower()
-    df['리뷰작성일'] = pd.to_datetime(df['리뷰작성일'], errors='coerce', format="%Y%m%d")
-    df = df[(df['별점'] >= rating_range[0]) & (df['별점'] <= rating_range[1])]
-    # if start_date:
-    #     df = df[df['리뷰작성일'] >= pd.to_datetime(start_date)]
-    # if end_date:
-    #     df = df[df['리뷰작성일'] <= pd.to_datetime(end_date)]
-
-    scores = {k: 0 for k in extended_keywords}
-    examples = {k: [] for k in extended_keywords}
-    total_mentions = 0
-
-    for review in df['리뷰 내용']:
-        for criterion, keywords in extended_keywords.items():
-            if any(keyword in review for keyword in keywords):
-                if any(neg in review for neg in negative_words):
-                    continue
-                if any(pos in review for pos in positive_words):
-                    scores[criterion] += 1
-                    if len(examples[criterion]) < 5:
-                        highlighted = review
-                        for kw in keywords:
-                            highlighted = re.sub(f"({kw})", r"<span style='color:#d62728;font-weight:bold;'>\1</span>", highlighted)
-                        examples[criterion].append(highlighted)
-                    total_mentions += 1
-
-    ratios = {k: round(v / total_mentions * 100, 2) if total_mentions else 0 for k, v in scores.items()}
-    return ratios, examples
-
-def weekly_sentiment_trend(df, rating_range=(1, 5)):
-    df = df.copy()
-    df['리뷰 내용'] = df['리뷰 내용'].fillna("").str.lower()
-    df['리뷰작성일'] = pd.to_datetime(df['리뷰작성일'], errors='coerce', format="%Y%m%d")
-    df = df[(df['별점'] >= rating_range[0]) & (df['별점'] <= rating_range[1])]
-    df['week'] = df['리뷰작성일'].dt.to_period("W").apply(lambda r: r.start_time)
-
-    results = []
-    for week, group in df.groupby("week"):
-        total_reviews = len(group)
-        week_data = {"week": week, "total": total_reviews}
-        for criterion, keywords in extended_keywords.items():
-            count = 0
-            for review in group['리뷰 내용']:
-                if any(keyword in review for keyword in keywords):
-                    if any(neg in review for neg in negative_words):
-                        continue
-                    if any(pos in review for pos in positive_words):
-                        count += 1
-            week_data[criterion] = round(count / total_reviews * 100, 2) if total_reviews else 0
-        results.append(week_data)
-
-    return pd.DataFrame(results)
+def _rows_mentioning(tokens, reviews, words):
+    # 공백 없는 단어는 토큰 표에서, 공백이 포함된 구(예: '브랜드 느낌')만 원문에서 검사
+    found = tokens.rows_containing([w for w in words if ' ' not in w])
+    for w in words:
+        if ' ' in w:
+            found |= reviews['리뷰 내용'].str.contains(w, regex=False).to_numpy()
+    return found
+
+@st.cache_data(max_entries=4)
+def review_flags(_tag_grouped_dfs, version):
+    """전체 리뷰의 기준 언급 / 부정어 / 긍정어 여부 (데이터셋 버전당 한 번, 행 = 저장소 행 번호)"""
+    tokens, reviews = _tag_grouped_dfs.tokens, _tag_grouped_dfs.reviews
+    flags = pd.DataFrame({criterion: _rows_mentioning(tokens, reviews, keywords)
+                          for criterion, keywords in extended_keywords.items()})
+    flags['부정'] = _rows_mentioning(tokens, reviews, negative_words)
+    flags['긍정'] = _rows_mentioning(tokens, reviews, positive_words)
+    return flags
+
+def _positive_hits(flags):
+    """기준별 '언급 O + 부정어 X + 긍정어 O' 리뷰 여부"""
+    positive = (flags['긍정'] & ~flags['부정']).to_numpy()
+    return flags[list(extended_keywords)] & positive[:, None]
+
+def _ratios(scores):
+    total_mentions = sum(scores.values())
+    return {k: round(v / total_mentions * 100, 2) if total_mentions else 0 for k, v in scores.items()}
+
+@st.cache_data(max_entries=4)
+def aspect_cube(_tag_grouped_dfs, version):
+    """브랜드 × 별점 × 주(월요일 시작) 셀별 리뷰 수(total)와 기준별 긍정 언급 수
+
+    별점 범위/주 구간 선택은 원본 리뷰 대신 이 셀들의 합으로 계산한다.
+    """
+    reviews = _tag_grouped_dfs.reviews
+    hits = _positive_hits(review_flags(_tag_grouped_dfs, version)).astype('int64')
+    hits.insert(0, 'total', 1)
+    keys = [reviews['tag'].astype(object).rename('tag'),
+            reviews['별점'].rename('별점'),
+            reviews['리뷰작성일'].dt.to_period('W').dt.start_time.rename('week')]
+    return hits.groupby(keys, dropna=False).sum()
+
+def _cube_cells(cube, rating_range, brand=None):
+    ratings = cube.index.get_level_values('별점')
+    mask = (ratings >= rating_range[0]) & (ratings <= rating_range[1])
+    if brand is not None:
+        mask &= cube.index.get_level_values('tag') == brand
+    return cube[mask]
+
+def brand_ratios(cube, brand, rating_range=(1, 5)):
+    """선택 브랜드의 기준 비율 (큐브 셀 합)"""
+    sums = _cube_cells(cube, rating_range, brand)[list(extended_keywords)].sum()
+    return _ratios({k: int(sums[k]) for k in extended_keywords})
+
+def brand_positioning(tag_grouped_dfs, cube, rating_range=(1, 5)):
+    """브랜드별 기준 비율 — 별점 범위 안의 큐브 셀을 브랜드별로 합산"""
+    sums = _cube_cells(cube, rating_range).groupby(level='tag').sum()
+
+    positioning_data = []
+    for tag in tag_grouped_dfs:
+        scores = {k: int(sums.at[tag, k]) if tag in sums.index else 0 for k in extended_keywords}
+        ratios = _ratios(scores)
+        if sum(ratios.values()) > 0:
+            positioning_data.append({
+                "브랜드": tag,
+                "성능": ratios["성능"],
+                "디자인": ratios["디자인"],
+                "가격": ratios["가격"]
+            })
+    return positioning_data
+
+def weekly_sentiment_trend(cube, brand, rating_range=(1, 5)):
+    grouped = _cube_cells(cube, rating_range, brand).groupby(level='week').sum()
+    total = grouped['total']
+    results = (grouped[list(extended_keywords)].div(total, axis=0) * 100).round(2)
+    results.insert(0, "total", total)
+    return results.reset_index()
 
 # Streamlit UI
 def render(tag_grouped_dfs):
@@ -81,9 +101,11 @@ def render(tag_grouped_dfs):
     # end_date = st.date_input("종료일", None)
     rating_range = st.slider("별점 범위", 1, 5, (1, 5))
 
+    # 슬라이더 변경 시에는 미리 만든 큐브의 셀만 다시 합산
+    cube = aspect_cube(tag_grouped_dfs, tag_grouped_dfs.version)
+
     if brand:
-        df = tag_grouped_dfs[brand]
-        ratios, examples = analyze_sentiment_with_examples(df, rating_range)
+        ratios = brand_ratios(cube, brand, rating_range)
         best = max(ratios, key=ratios.get)
 
         st.markdown(f"### ✅ 가장 긍정적으로 언급된 기준: **{best}**")
@@ -101,16 +123,7 @@ def render(tag_grouped_dfs):
         #     st.markdown(f"<div style='margin-bottom:10px;'>{review}</div>", unsafe_allow_html=True)
 
     # 전체 브랜드 분석
-    positioning_data = []
-    for tag, df in tag_grouped_dfs.items():
-        ratios, _ = analyze_sentiment_with_examples(df, rating_range)
-        if sum(ratios.values()) > 0:
-            positioning_data.append({
-                "브랜드": tag,
-                "성능": ratios["성능"],
-                "디자인": ratios["디자인"],
-                "가격": ratios["가격"]
-            })
+    positioning_data = brand_positioning(tag_grouped_dfs, cube, rating_range)
 
     # 결과 시각화
     if positioning_data:
@@ -140,7 +153,7 @@ def render(tag_grouped_dfs):
         # 주간 변화 추이 시각화
     st.subheader("주간 감성 변화 추이")
     if brand:
-        trend_df = weekly_sentiment_trend(tag_grouped_dfs[brand], rating_range)
+        trend_df = weekly_sentiment_trend(cube, brand, rating_range)
         fig_week = px.line(
             trend_df, x="week", y=["성능", "디자인", "가격"],
             labels={"value": "긍정 비율 (%)", "week": "주간"},
@@ -0,0 +1,66 @@
+import pandas as pd
+from utils.rollup import RATINGS, RATING_COLUMNS
+
+LENGTH_QUANTILES = [0.25, 0.5, 0.75, 0.9]
+QUANTILE_COLUMNS = [f'리뷰길이_p{int(q * 100)}' for q in LENGTH_QUANTILES]
+
+
+def summarize_frame(df):
+    """리뷰 프레임 하나의 요약 (통계표 행과 같은 키) — 저장소 밖의 임의 프레임용"""
+    lengths = df['리뷰 내용'].astype(str).str.len()
+    ratings = df['별점'].value_counts()
+    return {
+        '리뷰 수': len(df),
+        '평균 별점': df['별점'].mean(),
+        '평균 리뷰 길이': lengths.mean(),
+        '별점 분포': {r: int(ratings.get(r, 0)) for r in RATINGS},
+    }
+
+
+class ReviewStats:
+    """(그룹 기준, 그룹) 단위 리뷰 통계표 — 데이터셋 버전당 한 번 계산
+
+    리뷰 수 / 평균 별점 / 별점 1~5 개수 / 평균 리뷰 길이 / 리뷰 길이 분위수를 가진다.
+    비교 위젯과 별점 막대그래프는 원본 리뷰 대신 이 표의 한 행을 읽는다.
+    """
+
+    def __init__(self, reviews):
+        lengths = reviews['리뷰 내용'].astype(str).str.len().rename('리뷰 길이')
+        ratings = reviews['별점']
+        parts = {}
+        for column in ('tag', 'category'):
+            key = reviews[column].rename('그룹')
+            grouped_ratings = ratings.groupby(key, observed=True)
+            grouped_lengths = lengths.groupby(key, observed=True)
+            table = pd.DataFrame({'리뷰 수': grouped_ratings.size(),
+                                  '평균 별점': grouped_ratings.mean(),
+                                  '평균 리뷰 길이': grouped_lengths.mean()})
+            counts = pd.crosstab(key, ratings).reindex(columns=RATINGS, fill_value=0)
+            table[RATING_COLUMNS] = counts.reindex(table.index, fill_value=0).to_numpy()
+            # 리뷰가 없으면 unstack 결과에 분위수 열이 없으므로 열도 맞춰 둔다
+            quantiles = grouped_lengths.quantile(LENGTH_QUANTILES).unstack().reindex(columns=LENGTH_QUANTILES)
+            table[QUANTILE_COLUMNS] = quantiles.reindex(table.index).to_numpy()
+            parts[column] = table
+        self.table = pd.concat(parts, names=['기준']).sort_index()
+
+    def group(self, column, key):
+        """그룹 통계 행 (없는 그룹이면 리뷰 수 0 행)"""
+        try:
+            return self.table.loc[(column, key)]
+        except KeyError:
+            return pd.Series(0, index=self.table.columns, dtype='float64')
+
+    def summary(self, column, key):
+        """summarize_frame 과 같은 형태의 요약"""
+        row = self.group(column, key)
+        return {
+            '리뷰 수': int(row['리뷰 수']),
+            '평균 별점': row['평균 별점'] if row['리뷰 수'] else float('nan'),
+            '평균 리뷰 길이': row['평균 리뷰 길이'] if row['리뷰 수'] else float('nan'),
+            '별점 분포': {r: int(row[c]) for r, c in zip(RATINGS, RATING_COLUMNS)},
+        }
+
+    def groups(self, column, keys=None):
+        """기준 전체(또는 keys 순서)의 통계표"""
+        frame = self.table.loc[column]
+        return frame if keys is None else frame.reindex(list(keys))
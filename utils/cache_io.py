@@ -0,0 +1,41 @@
+import os
+import json
+import tempfile
+
+# 파생 데이터 캐시 폴더 (리뷰 스냅샷, 형태소, 주제 모델, 예측, 시장 큐브)
+# 데이터 로더 전체를 불러오지 않고도 경로를 쓸 수 있도록 따로 둔다
+SNAPSHOT_DIR = "./.cache"
+
+
+def atomic_write(path, write, label):
+    """write(임시 파일 경로)로 같은 폴더의 임시 파일에 쓴 뒤 os.replace 로 교체
+
+    임시 파일 이름이 호출마다 달라 여러 세션/스레드가 같은 경로에 동시에 저장해도 서로 덮어쓰지 않는다.
+    실패하면 임시 파일을 지우고 경고만 출력한다 (캐시는 다음 실행에서 다시 만든다). 성공 여부 반환
+    """
+    tmp = None
+    try:
+        folder = os.path.dirname(path) or '.'
+        os.makedirs(folder, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=folder, prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                         delete=False) as f:
+            tmp = f.name
+        write(tmp)
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        print(f"⚠️ {label} 저장 실패: {e}")
+        if tmp is not None and os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        return False
+
+
+def write_json(path, data, label):
+    """JSON 파일 원자적 저장 (한글 그대로, 들여쓰기 1)"""
+    def write(tmp):
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+    return atomic_write(path, write, label)
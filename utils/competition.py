@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+
+class BetaTensor:
+    """브랜드 × 브랜드 × 월 로그-로그 회귀계수 텐서
+
+    beta[i, j, t] 는 t 월에 끝나는 창(두 브랜드 모두 검색량 > 0 인 최근 window 개 월)에서
+    log(브랜드 i) 를 log(브랜드 j) 에 회귀한 기울기. 창이 없으면 NaN.
+    """
+
+    def __init__(self, beta, brands, dates):
+        self.beta = beta
+        self.brands = list(brands)
+        self.dates = dates
+        self._position = {b: i for i, b in enumerate(self.brands)}
+
+    def pair_series(self, brand_y, brand_x):
+        """log(brand_y) ~ log(brand_x) 기울기 시계열 (창이 있는 월만)"""
+        values = self.beta[self._position[brand_y], self._position[brand_x]]
+        valid = ~np.isnan(values)
+        return pd.Series(values[valid], index=self.dates[valid])
+
+    def latest(self):
+        """브랜드 쌍별 가장 최근 회귀계수 (브랜드 × 브랜드 표)"""
+        valid = ~np.isnan(self.beta)
+        has_any = valid.any(axis=2)
+        last = valid.shape[2] - 1 - np.argmax(valid[:, :, ::-1], axis=2)
+        values = np.take_along_axis(self.beta, last[:, :, None], axis=2)[:, :, 0]
+        return pd.DataFrame(np.where(has_any, values, np.nan), index=self.brands, columns=self.brands)
+
+
+def rolling_loglog_beta(df, window=12):
+    """모든 브랜드 쌍의 이동 창 로그-로그 OLS 기울기를 누적합으로 한 번에 계산
+
+    df: 월 × 브랜드 검색량. 쌍마다 두 브랜드 모두 > 0 인 월만 이어 붙여 window 개씩 창을 만든다
+    (쌍별로 LinearRegression 을 창마다 다시 학습하던 방식과 같은 기울기).
+    """
+    values = df.to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logs = np.where(values > 0, np.log(values), 0.0)
+    valid = values > 0                                        # (월, 브랜드)
+    T, B = valid.shape
+
+    # 쌍별 유효 월 마스크와 누적합 (앞에 0 행을 붙여 구간합 = 차분)
+    mask = (valid[:, :, None] & valid[:, None, :]).astype(np.float64)   # (월, y 브랜드, x 브랜드)
+    y = logs[:, :, None]
+    x = logs[:, None, :]
+
+    def cumulative(a):
+        return np.concatenate([np.zeros((1, B, B)), np.cumsum(a, axis=0)])
+
+    count = cumulative(mask)
+    sx, sy = cumulative(mask * x), cumulative(mask * y)
+    sxx, sxy = cumulative(mask * x * x), cumulative(mask * x * y)
+
+    # 창 시작 = 유효 월 누적 개수가 (현재 - window) 가 되는 첫 위치
+    # 쌍별 누적 개수 열(0..T, 비감소)을 쌍마다 T + 2 씩 띄워 이어 붙이면 전체가 정렬되므로
+    # searchsorted 한 번으로 모든 쌍의 시작 위치를 찾는다 (메모리 O(T × B²))
+    counts = count.astype(np.int64)
+    start_count = np.clip(counts[1:] - window, 0, None)
+    offset = np.arange(B * B, dtype=np.int64) * (T + 2)
+    flat = (counts.reshape(T + 1, B * B) + offset).T.ravel()
+    found = np.searchsorted(flat, start_count.reshape(T, B * B) + offset, side='left')
+    start = (found - np.arange(B * B, dtype=np.int64) * (T + 1)).reshape(T, B, B)         # (월, y, x)
+
+    def window_sum(c):
+        return c[1:] - np.take_along_axis(c, start, axis=0)
+
+    n, Sx, Sy, Sxx, Sxy = (window_sum(c) for c in (count, sx, sy, sxx, sxy))
+    denom = n * Sxx - Sx ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = np.where(np.abs(denom) > 1e-9 * np.maximum(n * Sxx, 1.0), (n * Sxy - Sx * Sy) / denom, 0.0)
+    ready = (mask > 0) & (counts[1:] >= window)
+    beta = np.where(ready, beta, np.nan)
+    return BetaTensor(np.moveaxis(beta, 0, 2), df.columns, df.index)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from collections import Counter
+from scipy import sparse
+
+
+class ContextMatrix:
+    """리뷰 × 문맥 단어 희소 행렬
+
+    대상 어간(targets)을 포함한 단어 바로 앞 단어(= extract_context 가 세는 단어)를
+    리뷰마다 한 번만 세어 CSR 행렬로 보관한다. 행은 리뷰 저장소의 행 번호이고,
+    전체 TOP-N 과 브랜드별 빈도가 모두 이 행렬의 축약(합계)으로 계산된다.
+    """
+
+    def __init__(self, tokens, targets, stopwords):
+        ids, row_of, hit = tokens.context_hits(None, targets, stopwords)
+        entry_rows = row_of[:-1][hit]
+        entry_vocab = ids[:-1][hit]
+        entry_pos = np.flatnonzero(hit)
+
+        vocab_ids, entry_cols = np.unique(entry_vocab, return_inverse=True)
+        self.words = [tokens.vocab[i] for i in vocab_ids]
+        self.n_rows = len(tokens)
+        self.span = len(ids) + 1
+
+        # (리뷰, 단어) 쌍별 빈도와 리뷰 안 첫 등장 위치 (토큰 순서대로라 첫 인덱스 = 첫 등장)
+        n_cols = max(len(self.words), 1)
+        keys, first, counts = np.unique(entry_rows.astype(np.int64) * n_cols + entry_cols,
+                                        return_index=True, return_counts=True)
+        self.entry_rows = keys // n_cols
+        self.entry_cols = keys % n_cols
+        self.entry_counts = counts
+        self.entry_first = entry_pos[first]
+        self.counts = sparse.csr_matrix((counts, (self.entry_rows, self.entry_cols)),
+                                        shape=(self.n_rows, len(self.words)))
+
+    def _as_rows(self, rows):
+        if rows is None:
+            return np.arange(self.n_rows)
+        if isinstance(rows, slice):
+            return np.arange(self.n_rows)[rows]
+        return np.asarray(rows, dtype=np.int64)
+
+    def _ranked_entries(self, rows):
+        """rows 에 속한 항목만 (rows 안 순위, 열, 빈도, 첫 등장 키) 반환"""
+        rank = np.full(self.n_rows, -1, dtype=np.int64)
+        rows = self._as_rows(rows)
+        rank[rows] = np.arange(len(rows))
+        entry_rank = rank[self.entry_rows]
+        keep = entry_rank >= 0
+        entry_rank = entry_rank[keep]
+        return (entry_rank, self.entry_cols[keep], self.entry_counts[keep],
+                entry_rank * self.span + self.entry_first[keep])
+
+    def ordered_totals(self, rows):
+        """rows 전체의 단어별 빈도와 첫 등장 순서 (열 번호 배열, 빈도 배열)"""
+        _, cols, counts, first_key = self._ranked_entries(rows)
+        total = np.bincount(cols, weights=counts, minlength=len(self.words)).astype(np.int64)
+        first = np.full(len(self.words), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first, cols, first_key)
+        present = np.flatnonzero(total > 0)
+        present = present[np.argsort(first[present], kind='stable')]
+        return present, total[present]
+
+    def counter(self, rows):
+        """extract_context 와 같은 Counter (키 순서 포함)"""
+        cols, totals = self.ordered_totals(rows)
+        return Counter({self.words[c]: int(t) for c, t in zip(cols, totals)})
+
+    def group_counts(self, grouped, cols=None):
+        """그룹 × 단어 빈도표 — 그룹 지시 행렬과 리뷰 × 단어 행렬의 곱"""
+        keys = list(grouped)
+        group_rows = [self._as_rows(grouped.rows(k)) for k in keys]
+        sizes = [len(r) for r in group_rows]
+        indicator = sparse.csr_matrix(
+            (np.ones(sum(sizes), dtype=np.int64),
+             (np.repeat(np.arange(len(keys)), sizes), self._as_rows(grouped.all_rows()))),
+            shape=(len(keys), self.n_rows))
+        freq = indicator @ self.counts
+        if cols is not None:
+            freq = freq[:, cols]
+            words = [self.words[c] for c in cols]
+        else:
+            words = self.words
+        return pd.DataFrame(freq.toarray(), index=keys, columns=words)
+
@@ -1,7 +1,24 @@
 import streamlit as st
 import os
+import json
+import hashlib
+import multiprocessing
+import numpy as np
 import pandas as pd
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from utils.text_cleaner import clean_text
+from utils.tokens import TokenTable
+from utils.review_index import ReviewIndex
+from utils.context_matrix import ContextMatrix
+from utils.rollup import MonthlyRollup
+from utils.brand_stats import ReviewStats
+from utils.cache_io import SNAPSHOT_DIR, atomic_write, write_json
+
+# 공유 저장소의 프레임/뷰를 탭에서 수정해도 원본이 바뀌지 않도록 Copy-on-Write 사용
+# (pandas 3.0부터는 항상 켜져 있음)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
 
 CATEGORY_KEYWORDS = {
     '궐련형': ['궐련', '릴', '아이코스'],
@@ -9,38 +26,377 @@ CATEGORY_KEYWORDS = {
     '일회용': ['일회용', '일회']
 }
 
-@st.cache_data
-def load_data(folder="./data"):
-    tag_grouped_dfs = {}
-    category_grouped_dfs = {'궐련형': [], '액상형': [], '일회용': []}
+# 정제된 리뷰 코퍼스 스냅샷 (콜드 스타트 시 CSV 재파싱/재정제 생략, 폴더는 utils.cache_io.SNAPSHOT_DIR)
+SNAPSHOT_FILE = "reviews.parquet"
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_VERSION = 3
 
-    for fname in os.listdir(folder):
-        if fname.endswith(".csv"):
-            tag = fname.split('_')[0].strip('[]').replace("KT&G", "릴") 
-            lower_name = fname.lower()
-            matched_category = None
-            for category, keywords in CATEGORY_KEYWORDS.items():
-                if any(k in lower_name for k in keywords):
-                    matched_category = category
-                    break
-            path = os.path.join(folder, fname)
-            try:
-                df = pd.read_csv(path, encoding='utf-8-sig')
-                if '리뷰 내용' not in df.columns:
-                    continue
-                df['리뷰 내용'] = df['리뷰 내용'].astype(str).apply(clean_text)
-                tag_grouped_dfs.setdefault(tag, []).append(df)
-                if matched_category:
-                    category_grouped_dfs[matched_category].append(df)
-            except Exception as e:
-                print(f"⚠️ 파일 로딩 실패: {fname} - {e}")
-
-    for tag in tag_grouped_dfs:
-        tag_grouped_dfs[tag] = pd.concat(tag_grouped_dfs[tag], ignore_index=True)
-    for cat in category_grouped_dfs:
-        if category_grouped_dfs[cat]:
-            category_grouped_dfs[cat] = pd.concat(category_grouped_dfs[cat], ignore_index=True)
+META_COLUMNS = ['source', 'tag', 'category']
+
+# 로딩 시 한 번만 적용하는 리뷰 프레임 스키마 (날짜 파싱 포함)
+REVIEW_SCHEMA = {
+    '작성자': 'category',
+    '제품명': 'category',
+    '리뷰작성일': 'datetime64[ns]',
+    # 값이 없거나 숫자가 아닌 별점/도움 수는 0 이 아닌 결측(<NA>)으로 둔다
+    '별점': 'Int8',
+    '도움 수': 'Int32',
+    '리뷰 내용': 'string',
+    'source': 'category',
+    'tag': 'category',
+    'category': 'category',
+}
+# 대시보드에서 쓰지 않는 컬럼 (keep_optional=True일 때만 유지)
+OPTIONAL_COLUMNS = ['한달 사용기']
+
+
+def _file_md5(path):
+    h = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'md5': _file_md5(path)}
+
+
+def _is_unchanged(path, entry):
+    # 크기 → 수정시각 → 내용 해시 순으로 비교 (touch만 된 파일은 해시로 재사용)
+    stat = os.stat(path)
+    if entry.get('size') != stat.st_size:
+        return False
+    if entry.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    return entry.get('md5') == _file_md5(path)
+
+
+def _match_category(fname):
+    lower_name = fname.lower()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(k in lower_name for k in keywords):
+            return category
+    return None
+
+
+def _apply_schema(df, keep_optional=False):
+    drop = [c for c in df.columns if c.startswith('Unnamed:')]
+    if not keep_optional:
+        drop += [c for c in OPTIONAL_COLUMNS if c in df.columns]
+    df = df.drop(columns=drop)
+
+    for col, dtype in REVIEW_SCHEMA.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if dtype.startswith('datetime'):
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col].astype('string'), format='%Y%m%d', errors='coerce')
+            df[col] = df[col].astype(dtype)
+        elif dtype.startswith('Int'):
+            df[col] = np.trunc(pd.to_numeric(df[col], errors='coerce')).astype(dtype)
         else:
-            category_grouped_dfs[cat] = pd.DataFrame(columns=['리뷰 내용'])
+            df[col] = df[col].astype(dtype)
+    # 파일마다 타입이 다른 나머지 object 컬럼은 문자열로 통일 (Parquet 저장용)
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].astype('string')
+    return df
+
+
+def _memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def _read_review_file(folder, fname):
+    tag = fname.split('_')[0].strip('[]').replace("KT&G", "릴")
+    path = os.path.join(folder, fname)
+    try:
+        df = pd.read_csv(path, encoding='utf-8-sig')
+        if '리뷰 내용' not in df.columns:
+            return None
+        df['리뷰 내용'] = df['리뷰 내용'].astype(str).apply(clean_text)
+        df['source'] = fname
+        df['tag'] = tag
+        df['category'] = _match_category(fname)
+        return df, _apply_schema(df)
+    except Exception as e:
+        print(f"⚠️ 파일 로딩 실패: {fname} - {e}")
+        return None
+
+
+def _ingest_file(folder, fname):
+    entry = _fingerprint(os.path.join(folder, fname))
+    loaded = _read_review_file(folder, fname)
+    if loaded is None:
+        entry.update(rows=0, memory_before_mb=0.0, memory_after_mb=0.0)
+        return None, entry
+    raw, df = loaded
+    entry.update(rows=len(df), memory_before_mb=round(_memory_mb(raw), 3), memory_after_mb=round(_memory_mb(df), 3))
+    return df, entry
+
+
+def memory_report(manifest):
+    """파일별 스키마 적용 전/후 메모리 사용량(MB) 표"""
+    report = pd.DataFrame([
+        {'파일': fname, '행 수': entry.get('rows', 0),
+         '적용 전(MB)': entry.get('memory_before_mb', 0.0), '적용 후(MB)': entry.get('memory_after_mb', 0.0)}
+        for fname, entry in manifest.items()
+    ])
+    return report
+
+
+def _ingest_files(folder, sources, workers=None):
+    # 파일 단위로 프로세스 풀에 분배 (파싱 + clean_text + 카테고리 매칭)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(sources))
+    if workers <= 1:
+        return [_ingest_file(folder, fname) for fname in sources]
+    # Streamlit 서버는 스레드를 여럿 띄우므로 fork 하면 잠금 상태까지 복제될 수 있어 spawn
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return list(pool.map(_ingest_file, [folder] * len(sources), sources))
+
+
+def _build_reviews(folder, sources, workers=None):
+    frames, manifest = [], {}
+    for fname, (df, entry) in zip(sources, _ingest_files(folder, sources, workers)):
+        manifest[fname] = entry
+        if df is not None:
+            frames.append(df)
+
+    if frames:
+        reviews = pd.concat(frames, ignore_index=True)
+    else:
+        # 빈 프레임도 스키마 컬럼을 모두 갖도록 (저장소의 집계표가 날짜/별점 컬럼을 읽음)
+        reviews = pd.DataFrame(columns=list(dict.fromkeys(['리뷰 내용', *REVIEW_SCHEMA, *META_COLUMNS])))
+    return _apply_schema(reviews), manifest
+
+
+def _read_snapshot(folder, snapshot_dir):
+    """저장된 (리뷰 프레임, 파일 매니페스트) 반환. 사용할 수 없으면 (None, {})"""
+    manifest_path = os.path.join(snapshot_dir, MANIFEST_FILE)
+    snapshot_path = os.path.join(snapshot_dir, SNAPSHOT_FILE)
+    if not (os.path.exists(manifest_path) and os.path.exists(snapshot_path)):
+        return None, {}
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('version') != SNAPSHOT_VERSION or saved.get('folder') != os.path.abspath(folder):
+            return None, {}
+        files = saved.get('files', {})
+        reviews = pd.read_parquet(snapshot_path)
+        # 매니페스트의 파일별 행 수와 스냅샷이 어긋나면 전체 재구축
+        counts = reviews['source'].value_counts()
+        if any(counts.get(fname, 0) != entry.get('rows') for fname, entry in files.items()):
+            return None, {}
+        return reviews, files
+    except Exception as e:
+        print(f"⚠️ 스냅샷 로딩 실패: {e}")
+        return None, {}
+
+
+def _write_snapshot(reviews, manifest, folder, snapshot_dir):
+    snapshot_path = os.path.join(snapshot_dir, SNAPSHOT_FILE)
+    manifest_path = os.path.join(snapshot_dir, MANIFEST_FILE)
+    # 매니페스트는 스냅샷이 저장된 뒤에만 갱신 (읽을 때 행 수로 둘의 짝을 다시 확인)
+    if atomic_write(snapshot_path, lambda tmp: reviews.to_parquet(tmp, index=False), '스냅샷'):
+        write_json(manifest_path, {'version': SNAPSHOT_VERSION, 'folder': os.path.abspath(folder), 'files': manifest},
+                   '스냅샷 매니페스트')
+
+
+class GroupedReviews(Mapping):
+    """그룹 이름 → 리뷰 프레임 매핑
+
+    프레임을 따로 복사해 두지 않고, 요청 시 공유 리뷰 테이블에서 잘라 반환한다.
+    행 범위가 연속이면 iloc 슬라이스(뷰), 아니면 행 위치 배열로 take 한다.
+    """
+
+    def __init__(self, store, column, keys):
+        self.store = store
+        self.reviews = reviews = store.reviews
+        self.column = column
+        indices = reviews.groupby(column, observed=True, sort=False).indices
+        self._rows = {}
+        for key in keys:
+            positions = indices.get(key, np.array([], dtype=np.intp))
+            if len(positions) and positions[-1] - positions[0] + 1 == len(positions):
+                self._rows[key] = slice(int(positions[0]), int(positions[-1]) + 1)
+            elif len(positions):
+                self._rows[key] = positions
+            else:
+                self._rows[key] = slice(0, 0)
+
+    @property
+    def version(self):
+        return self.store.version
+
+    @property
+    def tokens(self):
+        return self.store.tokens
+
+    @property
+    def index(self):
+        return self.store.index
+
+    def context_matrix(self, targets, stopwords):
+        return self.store.context_matrix(targets, stopwords)
+
+    def monthly(self, key, start=None, end=None):
+        """그룹의 월별 사전 집계 (MonthlyRollup.monthly)"""
+        return self.store.rollup.monthly(self.column, key, start, end)
+
+    def summary(self, key):
+        """그룹의 사전 계산 통계 (ReviewStats.summary)"""
+        return self.store.stats.summary(self.column, key)
+
+    def statistics(self, keys=None):
+        """그룹별 사전 계산 통계표 (keys 순서, 없으면 전체)"""
+        return self.store.stats.groups(self.column, keys)
+
+    def rows(self, key):
+        """그룹의 행 위치 (슬라이스 또는 정수 배열)"""
+        return self._rows[key]
+
+    def sizes(self):
+        """그룹별 리뷰 수 (매핑 순서)"""
+        return pd.Series({key: len(range(len(self.reviews))[rows]) if isinstance(rows, slice) else len(rows)
+                          for key, rows in self._rows.items()}, dtype=np.int64)
+
+    def all_rows(self):
+        """매핑 순서대로 이어 붙인 전체 그룹의 행 위치"""
+        parts = [np.arange(len(self.reviews))[rows] if isinstance(rows, slice) else rows
+                 for rows in self._rows.values()]
+        return np.concatenate(parts) if parts else np.array([], dtype=np.intp)
+
+    def __getitem__(self, key):
+        rows = self._rows[key]
+        if isinstance(rows, slice):
+            return self.reviews.iloc[rows]
+        return self.reviews.take(rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+
+class ReviewStore:
+    """tag/category 컬럼을 가진 단일 리뷰 테이블
+
+    브랜드(tag)별로 연속된 행이 되도록 정렬해 두므로 by_tag 는 복사 없는 슬라이스,
+    by_category 는 행 위치 인덱스로 필요할 때만 꺼내 쓴다.
+    브랜드/유형을 가로지르는 집계는 reviews.groupby('tag') 한 번으로 처리한다.
+
+    version 은 데이터셋 버전 토큰으로, 캐시 함수는 코퍼스 대신 이 값을 키로 쓴다.
+    tokens 는 리뷰별 토큰 표(TokenTable)로, 각 탭이 문자열을 다시 분리하지 않도록 공유한다.
+    index 는 토큰 → 리뷰 행 역색인(ReviewIndex)으로, 키워드 검색을 전체 스캔 없이 처리한다.
+    rollup 은 브랜드/유형 × 월 사전 집계표(MonthlyRollup)로, 월별 차트를 원본 리뷰 없이 그린다.
+    stats 는 브랜드/유형별 통계표(ReviewStats)로, 비교 위젯과 별점 분포를 표 한 행으로 그린다.
+    context_matrix() 는 감정 대상 목록별 리뷰 × 문맥 단어 희소 행렬(ContextMatrix)을 한 번만 만든다.
+    """
+
+    def __init__(self, reviews, version=None):
+        self.version = version
+        # 파일 순서상 처음 등장한 순서대로 브랜드 정렬 (기존 딕셔너리 순서 유지)
+        tags = list(pd.unique(reviews['tag'].astype(object)))
+        rank = reviews['tag'].astype(object).map({tag: i for i, tag in enumerate(tags)})
+        order = np.argsort(rank.to_numpy(dtype=np.int64), kind='stable')
+        self.reviews = reviews.take(order).reset_index(drop=True)
+        self.tokens = TokenTable.build(self.reviews['리뷰 내용'])
+        self.index = ReviewIndex(self.tokens, self.reviews)
+        self.rollup = MonthlyRollup(self.reviews)
+        self.stats = ReviewStats(self.reviews)
+        self.by_tag = GroupedReviews(self, 'tag', tags)
+        self.by_category = GroupedReviews(self, 'category', list(CATEGORY_KEYWORDS))
+        self._context_matrices = {}
+
+    def context_matrix(self, targets, stopwords):
+        key = (tuple(targets), frozenset(stopwords))
+        if key not in self._context_matrices:
+            self._context_matrices[key] = ContextMatrix(self.tokens, targets, stopwords)
+        return self._context_matrices[key]
+
+
+def data_signature(folder="./data"):
+    """파일 이름/크기/수정시각만으로 만든 가벼운 서명 (캐시 키 용도)"""
+    signature = []
+    for fname in sorted(os.listdir(folder)):
+        if fname.endswith(".csv"):
+            stat = os.stat(os.path.join(folder, fname))
+            signature.append((fname, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def load_reviews(folder="./data", snapshot_dir=SNAPSHOT_DIR, workers=None):
+    """스냅샷 기준으로 신규/변경 CSV만 다시 수집해 병합, (리뷰 프레임, 매니페스트) 반환
+    workers=None이면 CPU 코어 수만큼 병렬 수집, 1이면 순차 수집"""
+    sources = sorted(f for f in os.listdir(folder) if f.endswith(".csv"))
+    reviews, files = _read_snapshot(folder, snapshot_dir)
+
+    # 같은 이름이라도 내용이 바뀐 파일은 기존 행을 버리고 다시 수집
+    stale = [fname for fname in files
+             if fname not in sources or not _is_unchanged(os.path.join(folder, fname), files[fname])]
+    pending = [fname for fname in sources if fname not in files or fname in stale]
+    if reviews is not None and not pending and not stale:
+        return reviews, files
+
+    if reviews is not None and stale:
+        reviews = reviews[~reviews['source'].isin(stale)]
+        files = {fname: entry for fname, entry in files.items() if fname not in stale}
+    if pending:
+        new_reviews, new_files = _build_reviews(folder, pending, workers)
+        reviews = new_reviews if reviews is None else pd.concat([reviews, new_reviews], ignore_index=True)
+        files.update(new_files)
+        print(f"🔄 리뷰 파일 수집: {len(pending)}개 (전체 {len(sources)}개)")
+        report = memory_report(new_files)
+        for _, row in report.iterrows():
+            print(f"📦 {row['파일']}: {row['적용 전(MB)']:.2f}MB → {row['적용 후(MB)']:.2f}MB")
+        print(f"📦 합계: {report['적용 전(MB)'].sum():.1f}MB → {report['적용 후(MB)'].sum():.1f}MB")
+    if reviews is None:
+        # CSV 도 스냅샷도 없으면 빈 리뷰 프레임
+        reviews, _ = _build_reviews(folder, [], workers)
+
+    # 파일 이름 순으로 정렬해 전체 재구축과 같은 행 순서 유지
+    # (파일별 카테고리 집합이 달라 병합 시 object로 풀린 컬럼은 다시 category로)
+    reviews = _apply_schema(reviews.sort_values('source', kind='stable', ignore_index=True))
+    _write_snapshot(reviews, files, folder, snapshot_dir)
+    return reviews, files
+
+
+def dataset_version(files):
+    """파일별 내용 해시/행 수로 만든 데이터셋 버전 토큰 (로딩 시 한 번 계산)"""
+    h = hashlib.md5(str(SNAPSHOT_VERSION).encode())
+    for fname in sorted(files):
+        entry = files[fname]
+        h.update(f"{fname}|{entry.get('md5')}|{entry.get('rows')}".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+@st.cache_resource(max_entries=1)
+def load_store(folder="./data", signature=None, workers=None):
+    """프로세스 전체(모든 세션)가 공유하는 읽기 전용 리뷰 저장소
+
+    cache_data 와 달리 호출마다 역직렬화된 사본을 만들지 않으므로,
+    반환된 프레임은 수정하지 말고 필요하면 copy() 후 사용한다.
+    """
+    reviews, files = load_reviews(folder, workers=workers)
+    return ReviewStore(reviews, dataset_version(files))
+
+
+def get_store(folder="./data", workers=None):
+    # 폴더 서명이 바뀌면 캐시 미스 → 변경된 파일만 증분 수집
+    return load_store(folder, data_signature(folder), workers)
+
+
+def refresh_data():
+    """공유 저장소를 비워 다음 호출 때 스냅샷/CSV 에서 다시 만든다"""
+    load_store.clear()
+
 
-    return category_grouped_dfs, tag_grouped_dfs
\ No newline at end of file
+def load_data(folder="./data", workers=None):
+    store = get_store(folder, workers)
+    return store.by_category, store.by_tag
@@ -0,0 +1,181 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+from utils.cache_io import SNAPSHOT_DIR, atomic_write
+from utils.search_store import SEARCH_CSV, read_search_volume
+
+FORECAST_DIR = os.path.join(SNAPSHOT_DIR, 'forecasts')
+FORECAST_VERSION = 1
+
+# tab5 급상승 키워드 예측에 쓰는 Prophet 설정 (바뀌면 저장된 예측은 자동으로 다시 학습)
+PROPHET_PARAMS = {
+    'seasonality_mode': 'multiplicative',
+    'changepoint_prior_scale': 0.5,
+    'seasonality': {'name': 'monthly', 'period': 30.5, 'fourier_order': 5},
+    'periods': 6,
+    'freq': 'M',
+}
+
+
+def series_fingerprint(df_target):
+    """(ds, y) 시계열 내용 해시 — 월별 데이터가 바뀌었을 때만 값이 달라진다"""
+    # melt 결과(float)와 원본 열(int)이 같은 지문을 갖도록 y 는 float 로 맞춘다
+    series = pd.DataFrame({'ds': df_target['ds'].astype('datetime64[ns]').to_numpy(), 'y': df_target['y'].astype('float64').to_numpy()})
+    h = hashlib.md5()
+    h.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _forecast_path(keyword, fingerprint, params, store_dir):
+    key = hashlib.md5(json.dumps([FORECAST_VERSION, keyword, fingerprint, params],
+                                 ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+    prefix = hashlib.md5(keyword.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(store_dir, f"{prefix}_{key[:16]}.parquet"), prefix
+
+
+def fit_forecast(df_target, params=PROPHET_PARAMS):
+    """Prophet 학습 + 예측 (프로세스 풀에서도 호출되므로 Prophet 은 여기서 import)"""
+    from prophet import Prophet
+    model = Prophet(seasonality_mode=params['seasonality_mode'],
+                    changepoint_prior_scale=params['changepoint_prior_scale'])
+    model.add_seasonality(**params['seasonality'])
+    model.fit(df_target)
+    future = model.make_future_dataframe(periods=params['periods'], freq=params['freq'])
+    return model.predict(future)
+
+
+def _write_forecast(forecast, path, prefix, store_dir):
+    if not atomic_write(path, lambda tmp: forecast.to_parquet(tmp, index=False), '예측'):
+        return
+    try:
+        # 같은 키워드의 이전 시계열/설정 예측 정리 (다른 세션이 쓰는 중인 임시 파일은 남긴다)
+        for fname in os.listdir(store_dir):
+            if (fname.startswith(prefix + '_') and not fname.endswith('.tmp')
+                    and os.path.join(store_dir, fname) != path):
+                os.remove(os.path.join(store_dir, fname))
+    except Exception as e:
+        print(f"⚠️ 예측 저장 실패: {e}")
+
+
+def load_forecast(keyword, df_target, params=PROPHET_PARAMS, store_dir=FORECAST_DIR):
+    """저장된 예측이 있으면 읽고, 없거나 시계열/설정이 바뀌었으면 학습 후 저장"""
+    path, prefix = _forecast_path(keyword, series_fingerprint(df_target), params, store_dir)
+    if os.path.exists(path):
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"⚠️ 예측 읽기 실패, 다시 학습합니다: {e}")
+    forecast = fit_forecast(df_target, params)
+    _write_forecast(forecast, path, prefix, store_dir)
+    return forecast
+
+
+# 빠른 예측 설정: log1p(검색량)에 가법 감쇠 Holt-Winters (월 계절성 12)
+# 평활 계수(α, β, φ, γ)는 키워드별로 격자 중 1-step 오차 제곱합이 가장 작은 조합을 고른다
+FAST_PARAMS = {
+    'season': 12,
+    'alphas': (0.2, 0.4, 0.6, 0.8, 1.0),
+    'betas': (0.0, 0.05, 0.2),
+    'phis': (0.8, 0.9, 0.98),
+    'gammas': (0.0, 0.1, 0.3),
+    'warmup': 12,
+    'periods': 6,
+    'interval_width': 0.8,
+}
+
+
+def fast_forecast_all(df_raw, params=FAST_PARAMS):
+    """모든 키워드 시계열 × 평활 계수 격자를 (키워드, 격자) 배열 하나로 동시에 갱신하는 배치 Holt-Winters
+
+    반환: 키워드 → Prophet 예측과 같은 (ds, yhat, yhat_lower, yhat_upper) 프레임.
+    과거 구간은 1-step 예측값, 미래 날짜는 Prophet make_future_dataframe(freq='M') 과 같은 월말 기준.
+    """
+    ds = pd.DatetimeIndex(df_raw['ds'])
+    keywords = list(df_raw.columns[1:])
+    raw = np.clip(np.nan_to_num(df_raw[keywords].to_numpy(dtype=np.float64)), 0, None)
+    Y = np.log1p(raw)                                         # (시점, 키워드)
+    n, K = Y.shape
+    m = params['season']
+
+    grid = np.array([(a, b, p, g) for a in params['alphas'] for b in params['betas']
+                     for p in params['phis'] for g in params['gammas']])
+    alpha, beta, phi, gamma = (grid[:, i][None, :] for i in range(4))
+
+    # 키워드별 첫 검색량(>0) 시점부터 상태 갱신, 워밍업 이후 오차만 평가
+    start = np.argmax(np.cumsum(raw > 0, axis=0) > 0, axis=0)
+    level = np.repeat(Y[start, np.arange(K)][:, None], len(grid), axis=1)
+    trend = np.zeros_like(level)
+    season = np.zeros((m,) + level.shape)
+    preds = np.zeros((n,) + level.shape)
+    sse = np.zeros_like(level)
+    scored = np.zeros(K)
+    for t in range(n):
+        y = Y[t][:, None]
+        on = (t >= start)[:, None]
+        s = season[t % m]
+        preds[t] = np.where(on, level + phi * trend + s, 0.0)
+        use = (t >= start + params['warmup'])[:, None]
+        sse += np.where(use, (y - preds[t]) ** 2, 0.0)
+        scored += use[:, 0]
+        new_level = alpha * (y - s) + (1 - alpha) * (level + phi * trend)
+        new_trend = beta * (new_level - level) + (1 - beta) * phi * trend
+        season[t % m] = np.where(on, gamma * (y - new_level) + (1 - gamma) * s, s)
+        level = np.where(on, new_level, level)
+        trend = np.where(on, new_trend, trend)
+
+    k = np.arange(K)
+    best = np.argmin(sse, axis=1)
+    sigma = np.sqrt(sse[k, best] / np.maximum(scored - grid.shape[1], 1))
+    best_alpha, _, best_phi, _ = grid[best].T
+
+    h = np.arange(1, params['periods'] + 1)[:, None]
+    future_fit = (level[k, best] + np.cumsum(best_phi[None, :] ** h, axis=0) * trend[k, best]
+                  + season[(n + h - 1) % m, k, best])
+    fitted = np.vstack([preds[:, k, best], future_fit])
+    # h-step 분산 근사: σ² (1 + (h-1) α²), 과거 구간은 σ²
+    steps = np.concatenate([np.zeros(n), np.arange(params['periods'])])[:, None]
+    z = NormalDist().inv_cdf((1 + params['interval_width']) / 2)
+    half = z * sigma[None, :] * np.sqrt(1 + steps * best_alpha[None, :] ** 2)
+
+    future = pd.date_range(start=ds[-1], periods=params['periods'] + 1, freq='ME')
+    all_ds = ds.append(future[future > ds[-1]][:params['periods']])
+    yhat = np.clip(np.expm1(fitted), 0, None)
+    lower = np.clip(np.expm1(fitted - half), 0, None)
+    upper = np.expm1(fitted + half)
+    return {kw: pd.DataFrame({'ds': all_ds, 'yhat': yhat[:, i], 'yhat_lower': lower[:, i], 'yhat_upper': upper[:, i]})
+            for i, kw in enumerate(keywords)}
+
+
+def _prefit_one(args):
+    keyword, df_target, params, store_dir = args
+    load_forecast(keyword, df_target, params, store_dir)
+    return keyword
+
+
+def prefit_all(path=SEARCH_CSV, params=PROPHET_PARAMS, store_dir=FORECAST_DIR, workers=None):
+    """검색량 CSV 의 모든 키워드 예측을 미리 학습해 저장 (이미 최신인 키워드는 건너뜀)
+    workers=None이면 CPU 코어 수만큼 병렬, 1이면 순차"""
+    df_raw = read_search_volume(path)
+    pending = []
+    for keyword in df_raw.columns[1:]:
+        df_target = df_raw[['ds', keyword]].rename(columns={keyword: 'y'})
+        forecast_path, _ = _forecast_path(keyword, series_fingerprint(df_target), params, store_dir)
+        if not os.path.exists(forecast_path):
+            pending.append((keyword, df_target, params, store_dir))
+
+    print(f"🔄 예측 사전 학습: {len(pending)}개 (최신 {len(df_raw.columns) - 1 - len(pending)}개)")
+    if workers == 1 or len(pending) <= 1:
+        done = [_prefit_one(job) for job in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(_prefit_one, pending))
+    return done
+
+
+if __name__ == '__main__':
+    # python -m utils.forecast_store
+    prefit_all()
@@ -0,0 +1,84 @@
+import os
+import numpy as np
+import pandas as pd
+from utils.cache_io import SNAPSHOT_DIR, atomic_write
+
+CUBE_DIR = os.path.join(SNAPSHOT_DIR, 'market')
+HASH_COLUMN = '_row_hash'
+
+
+# HHI 계산 안정화
+def calculate_hhi(df_slice):
+    total = df_slice.sum(axis=1)
+    market_share = df_slice.div(total.replace(0, np.nan), axis=0)
+    hhi = (market_share.fillna(0) ** 2).sum(axis=1) * 10000
+    hhi[total == 0] = 0
+    return hhi, market_share
+
+
+# 브랜드 첫 등장 시점 찾기
+def find_brand_debut(df):
+    positive = df.to_numpy() > 0
+    first = positive.argmax(axis=0)
+    return {brand: df.index[first[i]] for i, brand in enumerate(df.columns) if positive[:, i].any()}
+
+
+class Market:
+    """시장(전체/제품 유형) 하나의 월별 HHI, 브랜드 점유율, 브랜드 등장 시점"""
+
+    def __init__(self, name, brands, hhi, market_share, debut_points):
+        self.name = name
+        self.brands = brands
+        self.hhi = hhi
+        self.market_share = market_share
+        self.debut_points = debut_points
+
+
+def _read_cube(path, brands):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        cube = pd.read_parquet(path)
+    except Exception as e:
+        print(f"⚠️ 시장 큐브 읽기 실패: {e}")
+        return None
+    if list(cube.columns) != brands + ['HHI', HASH_COLUMN]:
+        return None
+    return cube
+
+
+def _write_cube(cube, path):
+    atomic_write(path, cube.to_parquet, '시장 큐브')
+
+
+def build_market(name, volumes, path=None):
+    """월별 HHI/점유율 계산. 저장된 큐브가 있으면 내용이 같은 월(행 해시 일치)은 재사용하고
+    새로 추가·변경된 월만 계산한다 (HHI/점유율은 월마다 독립)."""
+    brands = list(volumes.columns)
+    hashes = pd.util.hash_pandas_object(volumes, index=True).to_numpy().astype(np.int64)
+    cached = _read_cube(path, brands)
+
+    fresh = np.ones(len(volumes), dtype=bool)
+    if cached is not None:
+        known = pd.Series(cached[HASH_COLUMN].to_numpy(), index=cached.index)
+        fresh = known.reindex(volumes.index).to_numpy() != hashes
+
+    if fresh.any():
+        hhi_new, share_new = calculate_hhi(volumes[fresh])
+        computed = share_new.assign(HHI=hhi_new, **{HASH_COLUMN: hashes[fresh]})
+        cube = computed if cached is None else pd.concat([cached.loc[volumes.index[~fresh]], computed])
+        cube = cube.sort_index()
+        if path:
+            _write_cube(cube, path)
+        if cached is not None:
+            print(f"📦 {name} 시장 큐브: {int(fresh.sum())}개월 추가 계산 (재사용 {int((~fresh).sum())}개월)")
+    else:
+        cube = cached.loc[volumes.index]
+
+    return Market(name, brands, cube['HHI'], cube[brands], find_brand_debut(volumes))
+
+
+def build_markets(wide, markets, cube_dir=CUBE_DIR):
+    """시장 이름 → 브랜드 목록 매핑 전체를 계산 (시장별 큐브는 cube_dir 에 저장)"""
+    return {name: build_market(name, wide[brands], os.path.join(cube_dir, f"{name}.parquet") if cube_dir else None)
+            for name, brands in markets.items()}
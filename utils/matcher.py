@@ -0,0 +1,83 @@
+from collections import deque
+from functools import lru_cache
+
+
+class TargetMatcher:
+    """Aho-Corasick 오토마톤 기반 다중 패턴 부분 문자열 매칭
+
+    감정 대상 어간(POS_TARGETS / NEG_TARGETS / TARGETS 등)을 한 번에 컴파일해 두고,
+    문자열을 한 번만 훑어서 어떤 어간이 포함되어 있는지 찾는다.
+    (단어마다 any(t in word for t in targets) 로 어간 수만큼 검사하던 방식 대체)
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(dict.fromkeys(p for p in patterns if p))
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for pattern in self.patterns:
+            self._insert(pattern)
+        self._build_fail_links()
+
+    def _insert(self, pattern):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (pattern,)
+
+    def _build_fail_links(self):
+        # 루트 자식의 실패 링크는 루트(0) 그대로, 그 아래는 BFS 로 채운다
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _step(self, state, ch):
+        goto, fail = self._goto, self._fail
+        while state and ch not in goto[state]:
+            state = fail[state]
+        return goto[state].get(ch, 0)
+
+    def contains_any(self, text):
+        """패턴 중 하나라도 text 의 부분 문자열이면 True"""
+        out = self._out
+        state = 0
+        for ch in text:
+            state = self._step(state, ch)
+            if out[state]:
+                return True
+        return False
+
+    def find_all(self, text):
+        """(시작 위치, 패턴) 목록. 겹치는 매치도 모두 반환"""
+        out = self._out
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            state = self._step(state, ch)
+            for pattern in out[state]:
+                matches.append((i + 1 - len(pattern), pattern))
+        return matches
+
+
+@lru_cache(maxsize=64)
+def _compiled(patterns):
+    return TargetMatcher(patterns)
+
+
+def get_matcher(patterns):
+    """같은 패턴 목록은 오토마톤을 한 번만 만든다"""
+    return _compiled(tuple(patterns))
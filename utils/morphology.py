@@ -0,0 +1,98 @@
+import os
+import hashlib
+import threading
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from utils.cache_io import SNAPSHOT_DIR, atomic_write
+
+NOUNS_PATH = os.path.join(SNAPSHOT_DIR, 'morphology', 'nouns.parquet')
+BATCH_SIZE = 500
+
+# 프로세스당 형태소 분석기 하나 (Okt 생성 시 JVM 을 띄우므로 리뷰마다 만들지 않는다)
+_analyzer = None
+# 저장 경로 → {리뷰 해시: 명사} (디스크 저장분을 처음 한 번만 읽고 이후 새 리뷰만 추가)
+_nouns = {}
+_lock = threading.Lock()
+
+
+def _get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        from konlpy.tag import Okt
+        _analyzer = Okt()
+    return _analyzer
+
+
+def review_hash(text):
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def tokenize(text):
+    """리뷰 하나의 명사를 공백으로 이어 반환"""
+    return ' '.join(_get_analyzer().nouns(text)) if isinstance(text, str) else ''
+
+
+def _tokenize_batch(texts):
+    return [tokenize(text) for text in texts]
+
+
+def _tokenize_all(texts, workers=None, batch_size=BATCH_SIZE):
+    # 배치 단위로 프로세스 풀에 분배 (작업 프로세스마다 Okt 하나)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(batches))
+    if workers <= 1:
+        return [nouns for batch in batches for nouns in _tokenize_batch(batch)]
+    # JVM 이 떠 있는 프로세스를 fork 하면 자식에서 JVM 을 쓸 수 없으므로 spawn
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return [nouns for batch in pool.map(_tokenize_batch, batches) for nouns in batch]
+
+
+def _read_nouns(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        saved = pd.read_parquet(path)
+        return dict(zip(saved['hash'], saved['nouns']))
+    except Exception as e:
+        print(f"⚠️ 형태소 캐시 읽기 실패: {e}")
+        return {}
+
+
+def _write_nouns(nouns, path):
+    frame = pd.DataFrame({'hash': list(nouns), 'nouns': list(nouns.values())})
+    atomic_write(path, lambda tmp: frame.to_parquet(tmp, index=False), '형태소 캐시')
+
+
+def extract_nouns(texts, path=NOUNS_PATH, workers=None, batch_size=BATCH_SIZE):
+    """리뷰 텍스트별 명사 문자열 (texts 와 같은 인덱스의 Series)
+
+    리뷰 해시로 이전 분석 결과를 재사용하고, 처음 보는 리뷰만 배치로 나눠 분석한 뒤 디스크에 추가 저장한다.
+    workers=None이면 CPU 코어 수만큼 병렬, 1이면 순차
+    """
+    texts = pd.Series(texts)
+    hashes = [review_hash(text) if isinstance(text, str) else None for text in texts]
+
+    # 잠금은 캐시 조회/병합에만 쓰고, 오래 걸리는 형태소 분석은 잠금 밖에서 실행
+    # (다른 세션의 이미 분석된 브랜드 조회가 기다리지 않도록)
+    with _lock:
+        if path not in _nouns:
+            _nouns[path] = _read_nouns(path)
+        known = _nouns[path]
+        pending = {}
+        for text, h in zip(texts, hashes):
+            if h is not None and h not in known:
+                pending.setdefault(h, text)
+        if not pending:
+            return pd.Series([known[h] if h is not None else '' for h in hashes], index=texts.index, dtype=object)
+
+    print(f"🔄 형태소 분석: {len(pending)}개 (재사용 {len(set(hashes) - {None}) - len(pending)}개)")
+    fresh = dict(zip(pending, _tokenize_all(list(pending.values()), workers, batch_size)))
+
+    with _lock:
+        known.update(fresh)
+        _write_nouns(known, path)
+        return pd.Series([known[h] if h is not None else '' for h in hashes], index=texts.index, dtype=object)
@@ -0,0 +1,106 @@
+import re
+import threading
+import numpy as np
+import pandas as pd
+
+
+class ReviewIndex:
+    """토큰 → 리뷰 행 번호 역색인
+
+    TokenTable 의 어휘 ID 별로 등장 리뷰 행(정렬, 중복 제거)을 CSR 로 보관하고,
+    부분 문자열 키워드는 어휘 바이그램 색인으로 후보 어휘를 찾은 뒤 포스팅을 합친다.
+    str.contains(keyword) 전체 스캔 대신 조회 한 번으로 해당 리뷰를 찾는다.
+    """
+
+    def __init__(self, tokens, reviews):
+        self.tokens = tokens
+        self.reviews = reviews
+        row_of = np.repeat(np.arange(len(tokens), dtype=np.int64), np.diff(tokens.offsets))
+        # (어휘 ID, 행) 쌍 중복 제거 후 어휘 ID 순으로 정렬
+        pairs = np.unique(tokens.ids.astype(np.int64) * len(tokens) + row_of) if len(row_of) else np.empty(0, np.int64)
+        word_ids = pairs // max(len(tokens), 1)
+        self.postings = pairs - word_ids * len(tokens)
+        self.post_offsets = np.concatenate(([0], np.cumsum(np.bincount(word_ids, minlength=len(tokens.vocab)))))
+        self.months = reviews['리뷰작성일'].dt.to_period('M')
+        self._bigrams = None
+        # 저장소는 세션 스레드들이 공유하므로 조회 캐시는 잠금 안에서만 읽고 쓴다
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _bigram_index(self):
+        # 어휘 부분 문자열 조회용 바이그램 → 어휘 ID (첫 조회 때 한 번 생성)
+        if self._bigrams is None:
+            bigrams = {}
+            for word_id, word in enumerate(self.tokens.vocab):
+                for gram in {word[i:i + 2] for i in range(len(word) - 1)}:
+                    bigrams.setdefault(gram, []).append(word_id)
+            self._bigrams = {gram: np.asarray(ids, dtype=np.int64) for gram, ids in bigrams.items()}
+        return self._bigrams
+
+    def vocab_ids(self, part):
+        """part 를 부분 문자열로 포함한 어휘 ID"""
+        vocab = self.tokens.vocab
+        if len(part) < 2:
+            return np.flatnonzero(self.tokens.vocab_mask([part]))
+        bigrams = self._bigram_index()
+        candidates = None
+        for i in range(len(part) - 1):
+            ids = bigrams.get(part[i:i + 2])
+            if ids is None:
+                return np.empty(0, dtype=np.int64)
+            candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+        return np.asarray([i for i in candidates if part in vocab[i]], dtype=np.int64)
+
+    def _token_rows(self, part):
+        word_ids = self.vocab_ids(part)
+        if not len(word_ids):
+            return np.empty(0, dtype=np.int64)
+        chunks = [self.postings[self.post_offsets[w]:self.post_offsets[w + 1]] for w in word_ids]
+        return np.unique(np.concatenate(chunks))
+
+    def rows(self, keyword):
+        """keyword 를 부분 문자열로 포함한 리뷰 행 번호 (오름차순 = 저장소 순서)"""
+        with self._lock:
+            cached = self._cache.get(keyword)
+        if cached is not None:
+            return cached
+
+        parts = keyword.split()
+        if not parts:
+            # 빈 키워드/공백만 있는 키워드는 색인으로 처리할 수 없어 원문 비교
+            result = np.flatnonzero(self.reviews['리뷰 내용'].str.contains(keyword, regex=False).to_numpy())
+        elif any(re.search(r'[^가-힣]', p) for p in parts):
+            # 정제된 리뷰는 한글/공백만 남으므로 그 외 문자가 있으면 매칭 없음
+            result = np.empty(0, dtype=np.int64)
+        else:
+            result = self._token_rows(parts[0])
+            for part in parts[1:]:
+                result = np.intersect1d(result, self._token_rows(part), assume_unique=True)
+            if keyword != parts[0]:
+                # 여러 단어 구나 앞뒤 공백이 있는 키워드는 후보 행만 원문으로 확인
+                texts = self.reviews['리뷰 내용'].iloc[result]
+                result = result[texts.str.contains(keyword, regex=False).to_numpy()]
+
+        with self._lock:
+            if len(self._cache) >= 1024:
+                self._cache.clear()
+            self._cache[keyword] = result
+        return result
+
+    def count(self, keyword):
+        return len(self.rows(keyword))
+
+    def count_by(self, keyword, by='tag'):
+        """그룹(브랜드/유형)별 매칭 리뷰 수"""
+        rows = self.rows(keyword)
+        return self.reviews[by].iloc[rows].value_counts(sort=False)
+
+    def count_by_month(self, keyword, by='tag'):
+        """그룹 × 월 매칭 리뷰 수 표"""
+        rows = self.rows(keyword)
+        frame = pd.DataFrame({by: self.reviews[by].iloc[rows].to_numpy(), '월': self.months.iloc[rows].to_numpy()})
+        return frame.groupby([by, '월'], observed=True).size().unstack(fill_value=0)
+
+    def examples(self, keyword, max_examples=5):
+        """매칭 리뷰 원문 (저장소 순서)"""
+        return self.reviews['리뷰 내용'].iloc[self.rows(keyword)[:max_examples]].tolist()
@@ -0,0 +1,46 @@
+import pandas as pd
+
+RATINGS = [1, 2, 3, 4, 5]
+RATING_COLUMNS = [f'별점_{r}' for r in RATINGS]
+
+
+class MonthlyRollup:
+    """(그룹 기준, 그룹, 월) 단위로 미리 합산해 둔 리뷰 집계표
+
+    그룹 기준은 'tag'(브랜드) / 'category'(제품 유형)이고, 각 행은
+    리뷰 수 / 별점 수(별점이 있는 리뷰) / 별점 합 / 별점 1~5 개수 / 리뷰 길이 합을 가진다.
+    월별 차트나 기간 요약은 원본 리뷰 대신 이 표(수백 행)를 잘라서 계산한다.
+    """
+
+    def __init__(self, reviews):
+        base = pd.DataFrame({
+            '월': reviews['리뷰작성일'].dt.to_period('M'),
+            '리뷰 수': 1,
+            '별점 수': reviews['별점'].notna().astype('int64'),
+            '별점 합': reviews['별점'].fillna(0).astype('int64'),
+            '리뷰길이 합': reviews['리뷰 내용'].astype(str).str.len(),
+        })
+        for r, column in zip(RATINGS, RATING_COLUMNS):
+            base[column] = reviews['별점'].eq(r).fillna(False).astype('int64')
+
+        parts = {}
+        for column in ('tag', 'category'):
+            grouped = base.groupby([reviews[column].rename('그룹'), '월'], observed=True, sort=True)
+            parts[column] = grouped.sum()
+        self.table = pd.concat(parts, names=['기준']).sort_index()
+
+    def monthly(self, column, key, start=None, end=None):
+        """그룹의 월별 집계 (월 오름차순). start/end 는 월 범위(포함)"""
+        try:
+            frame = self.table.loc[(column, key)]
+        except KeyError:
+            return self.table.iloc[:0].droplevel([0, 1])
+        if start is not None:
+            frame = frame[frame.index >= pd.Period(start, 'M')]
+        if end is not None:
+            frame = frame[frame.index <= pd.Period(end, 'M')]
+        frame = frame.copy()
+        # 별점 없는 리뷰는 평균에서 제외 (Series.mean 과 같은 NaN 건너뛰기)
+        frame['평균 별점'] = frame['별점 합'] / frame['별점 수'].where(frame['별점 수'] > 0)
+        frame['평균 리뷰길이'] = frame['리뷰길이 합'] / frame['리뷰 수']
+        return frame
@@ -0,0 +1,128 @@
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.market_cube import CUBE_DIR, build_markets
+
+SEARCH_CSV = './search_data/월별 검색량 데이터.csv'
+PRODUCTS_XLSX = './search_data/250515_제품.xlsx'
+MANUAL_CATEGORY_CSV = './search_data/manual_brand_category.csv'
+CATEGORIES = ['액상형', '일회용', '궐련형']
+
+
+def read_search_volume(path=SEARCH_CSV):
+    """월별 검색량 CSV (ds + 키워드별 열)"""
+    df_raw = pd.read_csv(path)
+    df_raw = df_raw.rename(columns={'월': 'ds'})
+    df_raw['ds'] = pd.to_datetime(df_raw['ds'])
+    return df_raw
+
+
+class SearchVolumeStore:
+    """월별 검색량 와이드 행렬 (행 = 월, 열 = 키워드)
+
+    키워드 → 열 위치 사전으로 키워드별 시계열을 바로 꺼내고(melt 후 필터링 없음),
+    최근 3개월 대비 직전 3개월 성장률과 브랜드 제품 유형 분류를 한 번만 계산해 둔다.
+    제품 엑셀은 브랜드 분류가 처음 필요할 때만 읽는다.
+    markets() 는 시장별 HHI/점유율 큐브로, 디스크 큐브와 비교해 새로 추가된 월만 계산한다.
+    signature 는 파일 서명으로, 이 저장소에서 파생된 캐시 함수의 키로 쓴다.
+    """
+
+    def __init__(self, df_raw, signature=None, products_path=PRODUCTS_XLSX, manual_path=MANUAL_CATEGORY_CSV):
+        self.signature = signature
+        self.frame = df_raw
+        self.wide = df_raw.set_index('ds')
+        self.dates = self.wide.index
+        self.keywords = list(self.wide.columns)
+        self.values = self.wide.to_numpy()
+        self._position = {kw: i for i, kw in enumerate(self.keywords)}
+        self.growth_rates = self._growth_rates()
+        self.products_path = products_path
+        self.manual_path = manual_path
+        self.manual_missing = False
+        self._brand_categories = {}
+        self._markets = {}
+
+    def _growth_rates(self):
+        recent = self.wide.tail(3).mean()
+        previous = self.wide.iloc[-6:-3].mean()
+        return {kw: (recent[kw] - previous[kw]) / previous[kw] * 100 if previous[kw] > 0 else 0
+                for kw in self.keywords}
+
+    def series(self, keyword):
+        """키워드 검색량 시계열 (index = ds)"""
+        return pd.Series(self.values[:, self._position[keyword]], index=self.dates, name=keyword)
+
+    def target(self, keyword):
+        """예측 입력용 (ds, y) 프레임"""
+        return pd.DataFrame({'ds': self.dates, 'y': self.values[:, self._position[keyword]]})
+
+    def top_keywords(self, n=5):
+        return pd.Series(self.growth_rates).sort_values(ascending=False).head(n)
+
+    def bottom_keywords(self, n=5):
+        return pd.Series(self.growth_rates).sort_values().head(n)
+
+    def brand_categories(self, brands):
+        """브랜드 → 제품 유형 목록 (제품명 자동 분류 + 수동 분류 파일 보강, 연초는 전 유형)"""
+        key = tuple(brands)
+        if key not in self._brand_categories:
+            self._brand_categories[key] = self._classify(list(brands))
+        return self._brand_categories[key]
+
+    def markets(self, brands, cube_dir=CUBE_DIR):
+        """시장(전체 + 제품 유형별) → Market(HHI/점유율/등장 시점). 연초는 HHI 에서 제외"""
+        key = tuple(brands)
+        if key not in self._markets:
+            brand_category = self.brand_categories(brands)
+            markets = {'전체': [b for b in brands if b in self._position and b != '연초']}
+            for category in CATEGORIES:
+                markets[category] = [b for b, cats in brand_category.items() if category in cats and b != '연초']
+            self._markets[key] = build_markets(self.wide, markets, cube_dir)
+        return self._markets[key]
+
+    def _classify(self, brands):
+        products = pd.read_excel(self.products_path, sheet_name='Sheet1')
+        names = products['제품명'].str.lower()
+        flags = products[CATEGORIES].eq('o').to_numpy()
+
+        brand_category = {}
+        for brand in brands:
+            matched = names.str.contains(brand.lower(), na=False).to_numpy()
+            found = flags[matched].any(axis=0) if matched.any() else np.zeros(len(CATEGORIES), dtype=bool)
+            brand_category[brand] = [c for c, hit in zip(CATEGORIES, found) if hit]
+
+        # 수동 분류 보강 (수동분류 파일 존재시 적용)
+        try:
+            manual = pd.read_csv(self.manual_path)
+            for brand, category in zip(manual['브랜드명'], manual['분류']):
+                categories = brand_category.setdefault(brand, [])
+                if category not in categories:
+                    categories.append(category)
+        except Exception:
+            self.manual_missing = True
+
+        if '연초' in brand_category:
+            brand_category['연초'] = list(CATEGORIES)
+        return brand_category
+
+
+def search_signature(paths=(SEARCH_CSV, PRODUCTS_XLSX, MANUAL_CATEGORY_CSV)):
+    """검색량/제품 파일 크기·수정시각 서명 (캐시 키 용도)"""
+    signature = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+@st.cache_resource(max_entries=1)
+def load_search_store(path=SEARCH_CSV, signature=None):
+    """모든 세션이 공유하는 읽기 전용 검색량 저장소 (처음 호출될 때 생성)"""
+    return SearchVolumeStore(read_search_volume(path), signature)
+
+
+def get_search_store(path=SEARCH_CSV):
+    # 파일이 바뀌면 서명이 달라져 다시 읽음
+    return load_search_store(path, search_signature())
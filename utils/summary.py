@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 
-def calculate_summary(df: pd.DataFrame):
+def calculate_summary(df: pd.DataFrame, index=None):
+    # index: 리뷰 역색인(ReviewIndex). 주어지면 키워드 포함 여부를 str.contains 대신 색인 조회로 판정
     if df.empty or '제품 유형' not in df.columns or '리뷰작성일' not in df.columns or '감정' not in df.columns:
         return None
 
@@ -15,9 +16,14 @@ def calculate_summary(df: pd.DataFrame):
     main_type = df['제품 유형'].mode()[0]
     main_ratio = (df[df['제품 유형'] == main_type].shape[0] / total_count) * 100 if total_count > 0 else 0
 
+    def contains(df_part, keyword):
+        if index is not None:
+            return df_part.index.isin(index.rows(keyword))
+        return df_part['리뷰 내용'].str.contains(keyword, na=False)
+
     def growth_rate(df_recent, df_prev, keyword, sentiment):
-        r = df_recent[(df_recent['감정'] == sentiment) & (df_recent['리뷰 내용'].str.contains(keyword, na=False))]
-        p = df_prev[(df_prev['감정'] == sentiment) & (df_prev['리뷰 내용'].str.contains(keyword, na=False))]
+        r = df_recent[(df_recent['감정'] == sentiment) & contains(df_recent, keyword)]
+        p = df_prev[(df_prev['감정'] == sentiment) & contains(df_prev, keyword)]
         if len(p) == 0:
             return 100.0 if len(r) > 0 else 0.0
         return ((len(r) - len(p)) / len(p)) * 100
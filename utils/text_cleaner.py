@@ -1,7 +1,7 @@
-import streamlit as st
 import re
 from soynlp.tokenizer import RegexTokenizer
 from collections import Counter
+from utils.matcher import get_matcher
 
 STOPWORDS = set([
     '이', '가', '을', '를', '은', '는', '와', '과', '도', '에서', '에게', '보다', '까지', '부터',
@@ -43,19 +43,26 @@ def clean_text(text):
 #     text = str(text).replace("KT&G", "릴") 
 #     return re.sub(r'[^가-힣\s]', '', text)
 
-@st.cache_data
+WORD_PATTERN = re.compile(r'[가-힣]{2,}')
+
 def extract_context(texts, targets, stopwords=STOPWORDS):
+    # 대상 어간을 포함한 단어 바로 앞 단어를 센다.
+    # 어간 포함 여부는 Aho-Corasick 오토마톤으로 고유 단어마다 한 번만 판정 (결과는 기존 Counter 와 동일)
+    matcher = get_matcher(targets)
+    is_target = {}
     phrases = []
     for text in texts:
-        words = re.findall(r'[가-힣]{2,}', text)
-        phrases.extend([
-            words[i - 1] for i, word in enumerate(words)
-            if i > 0 and any(t in word for t in targets) and words[i - 1] not in stopwords
-        ])
+        words = WORD_PATTERN.findall(text)
+        for i in range(1, len(words)):
+            word = words[i]
+            hit = is_target.get(word)
+            if hit is None:
+                hit = is_target[word] = matcher.contains_any(word)
+            if hit and words[i - 1] not in stopwords:
+                phrases.append(words[i - 1])
     return Counter(phrases)
 
 # 단어 정규화 및 가중치 빈도 분석
-@st.cache_data
 def normalize_texts(texts, stopwords=None, synonym_map=None):
     if stopwords is None:
         stopwords = set()
@@ -73,4 +80,5 @@ def normalize_texts(texts, stopwords=None, synonym_map=None):
                 word = synonym_map.get(word, word)
                 words.append(word)
         result.append(' '.join(words))
-    return result
\ No newline at end of file
+    return result
+
@@ -0,0 +1,117 @@
+import re
+import numpy as np
+import streamlit as st
+from collections import Counter
+from utils.matcher import get_matcher
+from utils.text_cleaner import STOPWORDS
+
+# 정제된 리뷰(한글 + 공백)의 토큰 = 한글 연속 구간
+# (soynlp RegexTokenizer 결과와 동일, extract_context 의 단어는 이 중 2글자 이상)
+TOKEN_PATTERN = re.compile(r'[가-힣]+')
+
+
+class TokenTable:
+    """리뷰별 토큰을 한 번만 분리해 어휘 ID 배열로 저장한 표 (CSR 형태)
+
+    ids[offsets[r]:offsets[r + 1]] 가 r 번째 리뷰의 토큰 ID,
+    vocab[id] 가 토큰 문자열이다. 행 번호는 리뷰 저장소의 행 위치(= 인덱스)와 같다.
+    """
+
+    def __init__(self, vocab, ids, offsets):
+        self.vocab = vocab
+        self.ids = ids
+        self.offsets = offsets
+        self.word_len = np.fromiter((len(w) for w in vocab), dtype=np.int32, count=len(vocab))
+        self._vocab_masks = {}
+
+    @classmethod
+    def build(cls, texts):
+        index = {}
+        ids, offsets = [], [0]
+        for text in texts:
+            for word in TOKEN_PATTERN.findall(text if isinstance(text, str) else ''):
+                ids.append(index.setdefault(word, len(index)))
+            offsets.append(len(ids))
+        return cls(list(index), np.asarray(ids, dtype=np.int32), np.asarray(offsets, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _rows(self, rows):
+        if rows is None:
+            return np.arange(len(self))
+        if isinstance(rows, slice):
+            return np.arange(len(self))[rows]
+        return np.asarray(rows, dtype=np.int64)
+
+    def gather(self, rows=None):
+        """선택한 행들의 (토큰 ID 배열, 토큰별 행 순번) — 행 순번은 rows 안에서의 위치"""
+        rows = self._rows(rows)
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        row_of = np.repeat(np.arange(len(rows)), lengths)
+        positions = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+        return self.ids[positions], row_of
+
+    def vocab_mask(self, patterns):
+        """패턴 중 하나라도 포함한 어휘 여부 (패턴 목록별로 한 번만 계산)"""
+        key = ('contains', tuple(patterns))
+        if key not in self._vocab_masks:
+            if len(patterns) == 1:
+                pattern = patterns[0]
+                found = (pattern in w for w in self.vocab)
+            else:
+                matcher = get_matcher(patterns)
+                found = (matcher.contains_any(w) for w in self.vocab)
+            self._vocab_masks[key] = np.fromiter(found, dtype=bool, count=len(self.vocab))
+        return self._vocab_masks[key]
+
+    def stopword_mask(self, stopwords):
+        key = ('stopwords', frozenset(stopwords))
+        if key not in self._vocab_masks:
+            self._vocab_masks[key] = np.fromiter(
+                (w in stopwords for w in self.vocab), dtype=bool, count=len(self.vocab))
+        return self._vocab_masks[key]
+
+    def context_hits(self, rows, targets, stopwords=STOPWORDS):
+        """2글자 이상 단어의 (토큰 ID, 행 순번, 문맥 여부)
+
+        hit[i] 는 같은 리뷰 안에서 ids[i + 1] 이 대상 어간을 포함하고 ids[i] 가 불용어가 아님
+        (= extract_context 가 ids[i] 를 센다). context_counts 와 ContextMatrix 가 함께 쓴다.
+        """
+        ids, row_of = self.gather(rows)
+        words = self.word_len[ids] >= 2
+        ids, row_of = ids[words], row_of[words]
+        hit = np.zeros(max(len(ids) - 1, 0), dtype=bool)
+        if len(ids) >= 2:
+            hit = (self.vocab_mask(targets)[ids[1:]]
+                   & (row_of[1:] == row_of[:-1])
+                   & ~self.stopword_mask(stopwords)[ids[:-1]])
+        return ids, row_of, hit
+
+    def context_counts(self, rows, targets, stopwords=STOPWORDS):
+        """extract_context 와 같은 결과(키 순서 포함)를 토큰 표에서 벡터 연산으로 계산"""
+        ids, _, hit = self.context_hits(rows, targets, stopwords)
+        prev = ids[:-1][hit]
+        uniq, first, counts = np.unique(prev, return_index=True, return_counts=True)
+        order = np.argsort(first, kind='stable')
+        return Counter({self.vocab[uniq[i]]: int(counts[i]) for i in order})
+
+    def rows_containing(self, patterns, rows=None):
+        """패턴(공백 없는 한글)을 부분 문자열로 포함한 리뷰 여부 (rows 순서의 bool 배열)"""
+        rows = self._rows(rows)
+        ids, row_of = self.gather(rows)
+        found = np.zeros(len(rows), dtype=bool)
+        found[row_of[self.vocab_mask(patterns)[ids]]] = True
+        return found
+
+
+# 데이터셋 버전 키 캐시: _rows 는 해시하지 않으므로 (version, scope) 가 행 집합을 유일하게 가리켜야 함
+# 예) scope=('tag', '아스몬', '2024-01-01', '2025-05-31')
+@st.cache_data(max_entries=512)
+def context_counts(_tokens, version, scope, _rows, targets, stopwords=STOPWORDS):
+    return _tokens.context_counts(_rows, targets, stopwords)
+
@@ -0,0 +1,86 @@
+import os
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from utils.cache_io import SNAPSHOT_DIR, write_json
+
+LABEL_PATH = os.path.join(SNAPSHOT_DIR, 'topics', 'labels.json')
+LABEL_WORKERS = 4
+LABEL_TIMEOUT = 20
+# 실패/시간 초과한 키워드 집합은 이 시간(초) 동안 다시 요청하지 않고 바로 키워드 분류로 대체
+FAILURE_TTL = 300
+
+# 저장 경로 → {정규화한 키워드 집합: 주제 이름}
+_labels = {}
+# 정규화한 키워드 집합 → 마지막 실패 시각 (time.monotonic, 프로세스 메모리에만 보관)
+_failures = {}
+_lock = threading.Lock()
+
+
+def label_key(keywords):
+    """순서·중복·앞뒤 공백과 무관한 키워드 집합 키"""
+    return '|'.join(sorted({k.strip() for k in keywords if k and k.strip()}))
+
+
+def _read_labels(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ 주제 이름 캐시 읽기 실패: {e}")
+        return {}
+
+
+def _write_labels(labels, path):
+    write_json(path, labels, '주제 이름 캐시')
+
+
+def label_topics(topics, request_label, fallback, path=LABEL_PATH, workers=LABEL_WORKERS, timeout=LABEL_TIMEOUT,
+                 failure_ttl=FAILURE_TTL):
+    """주제(키워드 목록)별 이름을 한 번에 붙인다
+
+    캐시에 없는 키워드 집합만 최대 workers 개 스레드로 동시에 request_label 을 호출하고,
+    timeout 초 안에 끝나지 않았거나 실패한 주제는 fallback 으로 채운다. fallback 결과는 저장하지 않지만
+    실패한 키워드 집합은 failure_ttl 초 동안 다시 요청하지 않는다 (API 장애 시 매 rerun 마다 timeout 대기 방지).
+    """
+    keys = [label_key(keywords) for keywords in topics]
+    now = time.monotonic()
+    with _lock:
+        if path not in _labels:
+            _labels[path] = _read_labels(path)
+        known = dict(_labels[path])
+        failed_at = {key: _failures[key] for key in keys if key in _failures}
+
+    pending = {}
+    for key, keywords in zip(keys, topics):
+        if key not in known and (key not in failed_at or now - failed_at[key] >= failure_ttl):
+            pending.setdefault(key, keywords)
+
+    if pending:
+        pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending))))
+        futures = {key: pool.submit(request_label, keywords) for key, keywords in pending.items()}
+        done, _ = wait(futures.values(), timeout=timeout)
+        # 시간 초과된 요청은 기다리지 않음 (결과는 버린다)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+        fresh = {}
+        for key, future in futures.items():
+            if future in done and future.exception() is None and future.result():
+                fresh[key] = future.result()
+        failed = [key for key in pending if key not in fresh]
+        if failed:
+            print(f"⚠️ 주제 이름 요청 {len(failed)}개 실패/시간 초과, {failure_ttl}초 동안 키워드 분류로 대체")
+        with _lock:
+            for key in failed:
+                _failures[key] = time.monotonic()
+            for key in fresh:
+                _failures.pop(key, None)
+            if fresh:
+                _labels[path].update(fresh)
+                _write_labels(_labels[path], path)
+        known.update(fresh)
+
+    return [known[key] if key in known else fallback(keywords) for key, keywords in zip(keys, topics)]
@@ -0,0 +1,112 @@
+import os
+import json
+import hashlib
+import joblib
+import numpy as np
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import TfidfVectorizer
+from utils.cache_io import SNAPSHOT_DIR, atomic_write
+from utils.morphology import extract_nouns, review_hash
+
+TOPIC_DIR = os.path.join(SNAPSHOT_DIR, 'topics')
+TOPIC_VERSION = 1
+VECTORIZER_PARAMS = {'max_df': 0.9, 'min_df': 2}
+# 새 리뷰가 학습된 리뷰 수의 이 비율을 넘으면 어휘가 낡았다고 보고 처음부터 다시 학습
+REFIT_RATIO = 0.5
+# 학습에 쓴 리뷰 중 지금은 없는(삭제·수정된) 리뷰가 이 비율을 넘으면 처음부터 다시 학습
+STALE_RATIO = 0.05
+# 이 이상의 리뷰를 처음 학습할 때는 모든 코어 사용
+LARGE_BRAND = 5000
+
+
+class TopicModel:
+    """브랜드 하나의 TF-IDF + LDA 주제 모델과 학습에 쓴 리뷰 해시 집합"""
+
+    def __init__(self, vectorizer, lda, hashes):
+        self.vectorizer = vectorizer
+        self.lda = lda
+        self.hashes = hashes
+
+    def topics(self, n_keywords=10):
+        """주제별 상위 키워드 목록"""
+        vocab = self.vectorizer.get_feature_names_out()
+        return [[vocab[i] for i in topic.argsort()[:-n_keywords - 1:-1]] for topic in self.lda.components_]
+
+
+def _model_path(brand, n_topics, store_dir):
+    key = hashlib.md5(json.dumps([TOPIC_VERSION, brand, n_topics, VECTORIZER_PARAMS],
+                                 ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+    return os.path.join(store_dir, f"{key[:16]}.joblib")
+
+
+def _read_model(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        return joblib.load(path)
+    except Exception as e:
+        print(f"⚠️ 주제 모델 읽기 실패, 다시 학습합니다: {e}")
+        return None
+
+
+def _write_model(model, path):
+    atomic_write(path, lambda tmp: joblib.dump(model, tmp), '주제 모델')
+
+
+def fit_topic_model(docs, hashes, n_topics, n_jobs=None):
+    """처음부터 학습. 유효한 어휘가 없으면 None"""
+    vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+    try:
+        dtm = vectorizer.fit_transform(docs)
+    except ValueError:
+        return None
+    if dtm.shape[0] == 0 or dtm.shape[1] == 0:
+        return None
+    if n_jobs is None and dtm.shape[0] >= LARGE_BRAND:
+        n_jobs = -1
+    lda = LatentDirichletAllocation(n_components=n_topics, random_state=42, n_jobs=n_jobs)
+    lda.fit(dtm)
+    return TopicModel(vectorizer, lda, set(hashes))
+
+
+def update_topic_model(model, docs, hashes):
+    """새 리뷰를 기존 어휘로 변환해 LDA partial_fit 으로 반영 (어휘는 고정)"""
+    dtm = model.vectorizer.transform(docs)
+    # 온라인 갱신 가중치가 지금까지 본 전체 리뷰 수 기준이 되도록
+    model.lda.set_params(total_samples=len(model.hashes) + len(hashes))
+    model.lda.partial_fit(dtm)
+    model.hashes.update(hashes)
+    return model
+
+
+def load_topic_model(brand, reviews, n_topics, store_dir=TOPIC_DIR, n_jobs=None):
+    """브랜드 주제 모델. 저장된 모델이 있으면 이미 학습한 리뷰는 건너뛰고 새 리뷰만 반영
+
+    model.hashes 는 모델 상태에 실제로 반영된 리뷰 집합이다. 그중 현재 리뷰에 없는 것이
+    STALE_RATIO 를 넘으면(삭제·수정 누적) partial_fit 대신 현재 리뷰로 다시 학습한다.
+
+    reviews: '리뷰 내용' 열이 있는 브랜드 리뷰 프레임. n_jobs=None이면 큰 브랜드만 병렬(-1)
+    """
+    texts = reviews['리뷰 내용'].astype(str)
+    docs = extract_nouns(texts).to_numpy()
+    hashes = np.array([review_hash(text) for text in texts])
+
+    path = _model_path(brand, n_topics, store_dir)
+    model = _read_model(path)
+    if model is not None:
+        stale = len(model.hashes - set(hashes))
+        fresh = np.array([h not in model.hashes for h in hashes], dtype=bool)
+        if stale > STALE_RATIO * len(model.hashes):
+            print(f"🔄 {brand} 주제 모델: 학습 후 사라진 리뷰 {stale}개, 다시 학습")
+        elif not fresh.any():
+            return model
+        elif fresh.sum() <= REFIT_RATIO * len(model.hashes):
+            print(f"🔄 {brand} 주제 모델: 새 리뷰 {int(fresh.sum())}개 반영 (partial_fit)")
+            model = update_topic_model(model, docs[fresh], hashes[fresh])
+            _write_model(model, path)
+            return model
+
+    model = fit_topic_model(docs, hashes, n_topics, n_jobs)
+    if model is not None:
+        _write_model(model, path)
+    return model